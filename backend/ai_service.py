@@ -1,4 +1,788 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import functools
+import httpx
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from models import InterviewType, EvaluationMode
+from local_scorer import LocalScorer, normalize_question
+from dedup import SingleFlight, MinHashIndex
+from resilience import CircuitBreaker, LatencyTracker
+from question_bank import QUESTION_BANK
+
+logger = logging.getLogger(__name__)
+
+LLM_MODEL = os.environ.get("LLM_MODEL", "gpt-4o-mini")
+# OpenAI-compatible chat completions endpoint; without a key the demo response is used.
+LLM_API_BASE = os.environ.get("LLM_API_BASE", "https://api.openai.com/v1")
+LLM_API_KEY = os.environ.get("LLM_API_KEY")
+# Process-wide cap on in-flight provider calls, shared by every request.
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", "16"))
+# Cap on how many calls a single request may fan out at once.
+LLM_REQUEST_CONCURRENCY = int(os.environ.get("LLM_REQUEST_CONCURRENCY", "5"))
+# Per-operation deadline for one provider call, hedge included.
+LLM_DEADLINES = {
+    "question": float(os.environ.get("LLM_DEADLINE_QUESTION", "8")),
+    "evaluation": float(os.environ.get("LLM_DEADLINE_EVALUATION", "10")),
+    "feedback": float(os.environ.get("LLM_DEADLINE_FEEDBACK", "15")),
+    "batch_evaluation": float(os.environ.get("LLM_DEADLINE_BATCH", "60")),
+}
+# Outer per-call timeout used by gather(). Never below a deadline, so it does
+# not cancel a call that complete() would still wait for.
+LLM_CALL_TIMEOUT = max(float(os.environ.get("LLM_CALL_TIMEOUT", "30")), max(LLM_DEADLINES.values()))
+# Send a second identical request when the first is slower than the observed p95.
+LLM_HEDGING = os.environ.get("LLM_HEDGING", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.environ.get("LLM_HEDGE_PERCENTILE", "95"))
+CIRCUIT_FAILURE_RATE = float(os.environ.get("LLM_CIRCUIT_FAILURE_RATE", "0.5"))
+CIRCUIT_COOLDOWN = float(os.environ.get("LLM_CIRCUIT_COOLDOWN", "30"))
+# An evaluation scoring below this makes the next question an adaptive follow-up
+# instead of the one generated speculatively alongside the evaluation.
+ADAPTIVE_FOLLOW_UP_SCORE = float(os.environ.get("ADAPTIVE_FOLLOW_UP_SCORE", "5.0"))
+# local: offline scorer only; hybrid: local pre-score refined by the model, with
+# the local result used when the model fails; llm: model only.
+EVALUATION_MODE = os.environ.get("EVALUATION_MODE", EvaluationMode.HYBRID.value)
+# Token budget for one batched evaluation request (prompt plus expected output).
+LLM_CONTEXT_TOKENS = int(os.environ.get("LLM_CONTEXT_TOKENS", "16000"))
+LLM_BATCH_MAX_ITEMS = int(os.environ.get("LLM_BATCH_MAX_ITEMS", "25"))
+BATCH_OUTPUT_TOKENS_PER_ITEM = 150
+# Reuse a previous model evaluation of the same question when the new answer's
+# estimated shingle similarity reaches this value; 0 disables reuse.
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+
+# Bump whenever a prompt template below changes so cached outputs are invalidated.
+FEEDBACK_PROMPT_VERSION = "feedback-v1"
+QUESTION_PROMPT_VERSION = "question-v1"
+EVALUATION_PROMPT_VERSION = "evaluation-v2"
+
+QUESTION_PROMPT = """You are conducting a {interview_type} interview.
+Ask question number {question_number} of 5.{focus}{history}
+
+Respond with JSON only, using the keys:
+"question" (string), "difficulty" ("easy", "medium" or "hard")."""
+
+EVALUATION_PROMPT = """You are evaluating a {interview_type} interview answer.
+
+Question: {question}
+Candidate answer: {answer}{baseline}
+
+Score each dimension from 0 to 10 and respond with JSON only, using the keys:
+"clarity", "confidence", "structure", "relevance", "score" (numbers),
+"weakness_identified" (short string), "feedback" (string)."""
+
+BATCH_EVALUATION_PROMPT = """You are evaluating interview answers.
+Score each numbered item independently; dimensions are from 0 to 10.
+
+{items}
+
+Respond with JSON only: {{"results": [...]}} with one object per item, using the keys
+"index" (the item number), "clarity", "confidence", "structure", "relevance", "score" (numbers),
+"weakness_identified" (short string), "feedback" (string)."""
+
+BATCH_EVALUATION_ITEM = """Item {index} ({interview_type} interview)
+Question: {question}
+Candidate answer: {answer}{baseline}
+"""
+
+FEEDBACK_PROMPT = """You are an interview coach. Review the candidate's answer.
+
+Question: {question}
+Candidate answer: {answer}
+Score: {score}/10
+
+Respond with JSON only, using the keys:
+"improved_answer" (string), "why_improved" (string),
+"mistakes" (list of {{"what_went_wrong": string, "correction": string}}),
+"tips" (list of strings)."""
+
+FEEDBACK_JSON_DELIMITER = "---JSON---"
+
+# Streaming variant: the improved answer comes first as plain text so it can be
+# forwarded token by token, followed by the structured remainder.
+STREAM_FEEDBACK_PROMPT = """You are an interview coach. Review the candidate's answer.
+
+Question: {question}
+Candidate answer: {answer}
+Score: {score}/10
+
+First write an improved version of the answer as plain text.
+Then write a line containing exactly """ + FEEDBACK_JSON_DELIMITER + """ followed by JSON only, using the keys:
+"why_improved" (string),
+"mistakes" (list of {{"what_went_wrong": string, "correction": string}}),
+"tips" (list of strings)."""
+
+# Fire-and-forget tasks stay referenced here until they finish; the event loop
+# only keeps weak references, so an unreferenced task can be collected mid-run.
+_background_tasks = set()
+
+
+def _background_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Background task failed: {task.exception()!r}")
+
+
+def run_in_background(coro: Awaitable[Any]) -> asyncio.Task:
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_done)
+    return task
+
+
+def parse_json_response(raw: str):
+    if not raw:
+        return None
+    text = raw.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end == -1:
+        return None
+    try:
+        return json.loads(text[start:end + 1])
+    except ValueError:
+        return None
+
+
+def fallback_question(interview_type: InterviewType, question_number: int) -> dict:
+    bank = QUESTION_BANK.get(interview_type, [])
+    if not bank:
+        return {"question": "Tell me about yourself.", "difficulty": "medium"}
+    return {"question": bank[(question_number - 1) % len(bank)]["question"], "difficulty": "medium"}
+
+
+def default_evaluation() -> dict:
+    return {
+        "score": 5.0,
+        "clarity": 5.0,
+        "confidence": 5.0,
+        "structure": 5.0,
+        "relevance": 5.0,
+        "weakness_identified": "",
+        "feedback": ""
+    }
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def local_baseline(local: Optional[dict]) -> str:
+    if not local:
+        return ""
+    scores = ", ".join(f"{k} {local[k]}" for k in ("clarity", "confidence", "structure", "relevance"))
+    return f"\nAutomated pre-score for reference (0-10): {scores}"
+
+
+def merge_llm_evaluation(parsed: dict, local: Optional[dict] = None) -> dict:
+    evaluation = {**default_evaluation(), **(local or {})}
+    for key in ("score", "clarity", "confidence", "structure", "relevance"):
+        try:
+            evaluation[key] = min(10.0, max(0.0, float(parsed.get(key, evaluation[key]))))
+        except (TypeError, ValueError):
+            pass
+    evaluation["weakness_identified"] = str(parsed.get("weakness_identified", evaluation["weakness_identified"]))
+    evaluation["feedback"] = str(parsed.get("feedback", ""))
+    evaluation["source"] = "llm"
+    return evaluation
+
+
+def needs_adaptive_follow_up(evaluation: dict) -> bool:
+    return evaluation.get("score", 10.0) < ADAPTIVE_FOLLOW_UP_SCORE
+
+
+def default_feedback(question: str, user_answer: str, score: float) -> dict:
+    mistakes = []
+    if score < 7.0:
+        mistakes.append({
+            "what_went_wrong": "The answer lacked specific examples and a clear structure.",
+            "correction": "Use the STAR method and back each point with a concrete example."
+        })
+    return {
+        "improved_answer": "",
+        "why_improved": "",
+        "mistakes": mistakes,
+        "tips": ["Practice STAR method", "Use specific examples", "Be concise and structured"]
+    }
+
+
+def instrumented(method):
+    # Reports end-to-end method latency (cache hits and fallbacks included) to hooks.
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self._emit("method", method=method.__name__, seconds=time.perf_counter() - started)
+    return wrapper
+
+
 class AIService:
+    model = LLM_MODEL
+    request_concurrency = LLM_REQUEST_CONCURRENCY
+
+    def __init__(self, max_concurrency: int = LLM_MAX_CONCURRENCY, evaluation_mode: str = EVALUATION_MODE):
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._http: Optional[httpx.AsyncClient] = None
+        self.breaker = CircuitBreaker(failure_rate=CIRCUIT_FAILURE_RATE, cooldown=CIRCUIT_COOLDOWN)
+        self.latency = {operation: LatencyTracker() for operation in LLM_DEADLINES}
+        self.provider_stats = {"calls": 0, "failures": 0, "timeouts": 0, "hedged": 0, "hedge_wins": 0}
+        self.evaluation_mode = EvaluationMode(evaluation_mode)
+        self.local_scorer = LocalScorer()
+        self._evaluation_flights = SingleFlight()
+        self._feedback_flights = SingleFlight()
+        self.near_duplicates = MinHashIndex(NEAR_DUPLICATE_THRESHOLD)
+        self.stats = {
+            "speculative_used": 0,
+            "speculative_discarded": 0,
+            "speculative_failed": 0,
+            "batch_requests": 0
+        }
+        self._hooks: List[Callable[[str, dict], None]] = []
+
+    def add_hook(self, hook: Callable[[str, dict], None]):
+        # hook(event, fields) for "call_started", "call_finished", "payload",
+        # "usage" and "method"; used for metrics, never for control flow.
+        self._hooks.append(hook)
+
+    def _emit(self, event: str, **fields):
+        for hook in self._hooks:
+            try:
+                hook(event, fields)
+            except Exception as e:
+                logger.warning(f"AI hook failed on {event}: {e!r}")
+
+    def _record_usage(self, prompt: str, completion: str, usage: Optional[dict] = None):
+        self._emit(
+            "payload",
+            prompt_bytes=len(prompt.encode("utf-8")),
+            completion_bytes=len(completion.encode("utf-8"))
+        )
+        if usage:
+            self._emit(
+                "usage",
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                source="provider"
+            )
+        else:
+            self._emit(
+                "usage",
+                prompt_tokens=estimate_tokens(prompt),
+                completion_tokens=estimate_tokens(completion),
+                source="estimated"
+            )
+
+    async def gather(
+        self,
+        calls: List[Callable[[], Awaitable[Any]]],
+        limit: int = LLM_REQUEST_CONCURRENCY,
+        timeout: Optional[float] = LLM_CALL_TIMEOUT,
+        fallback: Optional[Callable[[int, BaseException], Any]] = None
+    ) -> list:
+        # Runs the calls concurrently and returns their results in input order.
+        # A call that raises or exceeds the timeout is replaced by
+        # fallback(index, error) (or None) instead of failing the whole batch.
+        request_semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def run(index: int, call):
+            async with request_semaphore:
+                try:
+                    return await asyncio.wait_for(call(), timeout)
+                except Exception as e:
+                    logger.warning(f"AI call {index} failed: {e!r}")
+                    return fallback(index, e) if fallback else None
+
+        return await asyncio.gather(*(run(i, call) for i, call in enumerate(calls)))
+
+    @property
+    def feedback_version(self) -> str:
+        return f"{self.model}:{FEEDBACK_PROMPT_VERSION}"
+
+    def http_client(self) -> httpx.AsyncClient:
+        # One pooled client per process so connections and TLS sessions are reused.
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=LLM_API_BASE,
+                headers={"Authorization": f"Bearer {LLM_API_KEY}"},
+                timeout=httpx.Timeout(max(LLM_DEADLINES.values()), connect=5.0),
+                limits=httpx.Limits(max_connections=2 * self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     async def generate_response(self, question: str):
-        return "This is a demo AI response for InterviewIQ."
+        if not LLM_API_KEY:
+            return "This is a demo AI response for InterviewIQ."
+
+        response = await self.http_client().post("/chat/completions", json={
+            "model": self.model,
+            "messages": [{"role": "user", "content": question}],
+            "response_format": {"type": "json_object"}
+        })
+        response.raise_for_status()
+        body = response.json()
+        content = body["choices"][0]["message"]["content"]
+        self._record_usage(question, content, body.get("usage"))
+        return content
+
+    async def stream_response(self, question: str) -> AsyncIterator[str]:
+        if not LLM_API_KEY:
+            yield await self.generate_response(question)
+            return
+
+        completion, usage = [], None
+        async with self.http_client().stream("POST", "/chat/completions", json={
+            "model": self.model,
+            "messages": [{"role": "user", "content": question}],
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: ") or line == "data: [DONE]":
+                    continue
+                chunk = json.loads(line[6:])
+                usage = chunk.get("usage") or usage
+                if not chunk.get("choices"):
+                    continue
+                delta = chunk["choices"][0].get("delta", {}).get("content")
+                if delta:
+                    completion.append(delta)
+                    yield delta
+        self._record_usage(question, "".join(completion), usage)
+
+    async def stream_complete(self, prompt: str, operation: str) -> AsyncIterator[str]:
+        # Streaming counterpart of complete(): same breaker and deadline, applied
+        # to the whole stream. Ends early (without raising) on failure.
+        if not self.breaker.allow():
+            return
+
+        self.provider_stats["calls"] += 1
+        started = time.perf_counter()
+        deadline = started + LLM_DEADLINES[operation]
+        stream = self.stream_response(prompt).__aiter__()
+        outcome = "error"
+        self._emit("call_started", operation=operation)
+        try:
+            async with self._semaphore:
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        chunk = await asyncio.wait_for(stream.__anext__(), remaining)
+                    except StopAsyncIteration:
+                        break
+                    yield chunk
+            outcome = "ok"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            self.provider_stats["timeouts"] += 1
+            self.breaker.record(False)
+            logger.warning(f"AI {operation} stream exceeded {LLM_DEADLINES[operation]}s deadline")
+            return
+        except Exception as e:
+            self.provider_stats["failures"] += 1
+            self.breaker.record(False)
+            logger.warning(f"AI {operation} stream failed: {e!r}")
+            return
+        except BaseException:
+            # Cancelled or closed by the consumer: no verdict on the provider.
+            self.breaker.release()
+            raise
+        finally:
+            await stream.aclose()
+            self._emit("call_finished", operation=operation, outcome=outcome, seconds=time.perf_counter() - started)
+
+        self.breaker.record(True)
+        self.latency[operation].record(time.perf_counter() - started)
+
+    async def stream_feedback(self, question: str, user_answer: str, score: float) -> AsyncIterator[Tuple[str, dict]]:
+        # Yields ("feedback_delta", {"text": ...}) for each piece of the improved
+        # answer, then exactly one ("feedback", feedback) which is authoritative.
+        prompt = STREAM_FEEDBACK_PROMPT.format(question=question, answer=user_answer, score=score)
+        text, pending, in_json = "", "", False
+        holdback = len(FEEDBACK_JSON_DELIMITER) - 1
+
+        async for chunk in self.stream_complete(prompt, "feedback"):
+            text += chunk
+            if in_json:
+                continue
+            pending += chunk
+            if FEEDBACK_JSON_DELIMITER in pending:
+                delta = pending.split(FEEDBACK_JSON_DELIMITER, 1)[0]
+                in_json = True
+            else:
+                # Hold back enough characters that a delimiter split across
+                # chunks is never forwarded as answer text.
+                delta, pending = pending[:-holdback], pending[-holdback:]
+            if delta:
+                yield "feedback_delta", {"text": delta}
+
+        improved, found, remainder = text.partition(FEEDBACK_JSON_DELIMITER)
+        parsed = parse_json_response(remainder) if found else None
+        if not isinstance(parsed, dict):
+            logger.warning("Unparseable streamed feedback, using default feedback")
+            yield "feedback", {**default_feedback(question, user_answer, score), "fallback": True}
+            return
+
+        feedback = default_feedback(question, user_answer, score)
+        feedback.update({k: v for k, v in parsed.items() if k in feedback})
+        feedback["improved_answer"] = improved.strip()
+        yield "feedback", feedback
+
+    async def _attempt(self, prompt: str) -> str:
+        async with self._semaphore:
+            return await self.generate_response(prompt)
+
+    async def _hedged(self, prompt: str, operation: str) -> str:
+        first = asyncio.create_task(self._attempt(prompt))
+        tasks = {first}
+        try:
+            delay = self.latency[operation].percentile(LLM_HEDGE_PERCENTILE) if LLM_HEDGING else None
+            if delay is None:
+                return await first
+
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.provider_stats["hedged"] += 1
+                tasks.add(asyncio.create_task(self._attempt(prompt)))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self.provider_stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def complete(self, prompt: str, operation: str) -> Optional[str]:
+        # Every model call goes through here: the circuit breaker, the
+        # per-operation deadline and optional hedging. Returns None when the
+        # provider is unavailable so callers use their local/static fallback.
+        if not self.breaker.allow():
+            return None
+
+        self.provider_stats["calls"] += 1
+        started = time.perf_counter()
+        outcome = "error"
+        self._emit("call_started", operation=operation)
+        try:
+            raw = await asyncio.wait_for(self._hedged(prompt, operation), LLM_DEADLINES[operation])
+            outcome = "ok"
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            self.provider_stats["timeouts"] += 1
+            self.breaker.record(False)
+            logger.warning(f"AI {operation} call exceeded {LLM_DEADLINES[operation]}s deadline")
+            return None
+        except Exception as e:
+            self.provider_stats["failures"] += 1
+            self.breaker.record(False)
+            logger.warning(f"AI {operation} call failed: {e!r}")
+            return None
+        except BaseException:
+            # Cancelled (client gone, outer timeout): no verdict on the provider.
+            self.breaker.release()
+            raise
+        finally:
+            self._emit("call_finished", operation=operation, outcome=outcome, seconds=time.perf_counter() - started)
+
+        self.breaker.record(True)
+        self.latency[operation].record(time.perf_counter() - started)
+        return raw
+
+    def provider_health(self) -> dict:
+        return {
+            **self.provider_stats,
+            "circuit_state": self.breaker.state,
+            "circuit_opened": self.breaker.stats["opened"],
+            "circuit_rejected": self.breaker.stats["rejected"],
+            "p95_seconds": {op: tracker.percentile(95) for op, tracker in self.latency.items()}
+        }
+
+    def dedup_stats(self) -> dict:
+        evaluations = self._evaluation_flights.stats
+        feedback = self._feedback_flights.stats
+        near = self.near_duplicates.stats
+        return {
+            "evaluation_calls": evaluations["calls"],
+            "evaluation_coalesced": evaluations["coalesced"],
+            "feedback_calls": feedback["calls"],
+            "feedback_coalesced": feedback["coalesced"],
+            "near_duplicate_lookups": near["lookups"],
+            "near_duplicate_hits": near["hits"],
+            "near_duplicate_hit_rate": round(near["hits"] / near["lookups"], 4) if near["lookups"] else 0.0,
+            "near_duplicate_threshold": self.near_duplicates.threshold
+        }
+
+    @instrumented
+    async def generate_feedback(self, question: str, user_answer: str, score: float) -> dict:
+        return await self._feedback_flights.do(
+            (question, user_answer, score),
+            lambda: self._generate_feedback(question, user_answer, score)
+        )
+
+    async def _generate_feedback(self, question: str, user_answer: str, score: float) -> dict:
+        prompt = FEEDBACK_PROMPT.format(question=question, answer=user_answer, score=score)
+        parsed = parse_json_response(await self.complete(prompt, "feedback"))
+        if not isinstance(parsed, dict):
+            logger.warning("Unparseable feedback response, using default feedback")
+            return {**default_feedback(question, user_answer, score), "fallback": True}
+
+        feedback = default_feedback(question, user_answer, score)
+        feedback.update({k: v for k, v in parsed.items() if k in feedback})
+        return feedback
+
+    @instrumented
+    async def generate_question(
+        self,
+        interview_type: InterviewType,
+        question_number: int,
+        previous_answers: Optional[List[Dict[str, Any]]] = None,
+        focus_area: Optional[str] = None
+    ) -> dict:
+        focus = f"\nFocus area: {focus_area}" if focus_area else ""
+        history = ""
+        if previous_answers:
+            last = previous_answers[-1]
+            history = f"\nPrevious question: {last['question']}\nCandidate answer: {last['answer']}"
+            weakness = last.get("evaluation", {}).get("weakness_identified")
+            if weakness:
+                history += f"\nProbe this weakness with a follow-up: {weakness}"
+
+        prompt = QUESTION_PROMPT.format(
+            interview_type=interview_type.value,
+            question_number=question_number,
+            focus=focus,
+            history=history
+        )
+        parsed = parse_json_response(await self.complete(prompt, "question"))
+        if not isinstance(parsed, dict) or not parsed.get("question"):
+            return {**fallback_question(interview_type, question_number), "fallback": True}
+        return {"question": parsed["question"], "difficulty": parsed.get("difficulty", "medium")}
+
+    @instrumented
+    async def evaluate_answer(
+        self,
+        question: str,
+        answer: str,
+        interview_type: InterviewType,
+        mode: Optional[EvaluationMode] = None
+    ) -> dict:
+        mode = EvaluationMode(mode or self.evaluation_mode)
+        if mode == EvaluationMode.LOCAL:
+            return self.local_scorer.score(question, answer)
+
+        similar_key = (mode, interview_type, normalize_question(question))
+        reused = self.near_duplicates.lookup(similar_key, answer)
+        if reused is not None:
+            return {**reused, "near_duplicate": True}
+
+        evaluation = await self._evaluation_flights.do(
+            (mode, interview_type, question, answer),
+            lambda: self._evaluate_answer(question, answer, interview_type, mode)
+        )
+        if evaluation.get("source") == "llm":
+            self.near_duplicates.add(similar_key, answer, evaluation)
+        return evaluation
+
+    async def _evaluate_answer(self, question: str, answer: str, interview_type: InterviewType, mode: EvaluationMode) -> dict:
+        local = self.local_scorer.score(question, answer) if mode == EvaluationMode.HYBRID else None
+        evaluation = await self._evaluate_with_llm(question, answer, interview_type, local)
+        if evaluation is not None:
+            return evaluation
+        if local is not None:
+            return local
+        return {**default_evaluation(), "fallback": True}
+
+    def evaluate_answers_local(self, items: List[Dict[str, str]]) -> List[dict]:
+        return self.local_scorer.score_batch([(item["question"], item["answer"]) for item in items])
+
+    async def _evaluate_with_llm(
+        self,
+        question: str,
+        answer: str,
+        interview_type: InterviewType,
+        local: Optional[dict] = None
+    ) -> Optional[dict]:
+        prompt = EVALUATION_PROMPT.format(
+            interview_type=interview_type.value,
+            question=question,
+            answer=answer,
+            baseline=local_baseline(local)
+        )
+        parsed = parse_json_response(await self.complete(prompt, "evaluation"))
+        if not isinstance(parsed, dict):
+            logger.warning("Unparseable evaluation response")
+            return None
+        return merge_llm_evaluation(parsed, local)
+
+    def _pack_batches(self, prompt_items: List[str]) -> List[List[int]]:
+        # Greedily fill each request up to the context budget, counting the
+        # tokens each item's answer will need in the response as well.
+        budget = LLM_CONTEXT_TOKENS - estimate_tokens(BATCH_EVALUATION_PROMPT)
+        batches, current, used = [], [], 0
+        for index, text in enumerate(prompt_items):
+            cost = estimate_tokens(text) + BATCH_OUTPUT_TOKENS_PER_ITEM
+            if current and (used + cost > budget or len(current) >= LLM_BATCH_MAX_ITEMS):
+                batches.append(current)
+                current, used = [], 0
+            current.append(index)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _evaluate_batch_with_llm(self, prompt_items: List[str], indices: List[int]) -> Dict[int, dict]:
+        self.stats["batch_requests"] += 1
+        prompt = BATCH_EVALUATION_PROMPT.format(items="\n".join(prompt_items[i] for i in indices))
+        parsed = parse_json_response(await self.complete(prompt, "batch_evaluation"))
+        results = parsed.get("results") if isinstance(parsed, dict) else None
+        if not isinstance(results, list):
+            logger.warning("Unparseable batch evaluation response")
+            return {}
+
+        wanted = set(indices)
+        by_index = {}
+        for item in results:
+            try:
+                index = int(item.get("index"))
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if index in wanted:
+                by_index[index] = item
+        return by_index
+
+    @instrumented
+    async def evaluate_answers_batch(self, items: List[Dict[str, Any]], mode: Optional[EvaluationMode] = None) -> List[dict]:
+        # items: dicts with "question", "answer" and "interview_type". Results
+        # are returned in input order; items the model drops or garbles fall
+        # back to the local score (hybrid) or the default evaluation.
+        mode = EvaluationMode(mode or self.evaluation_mode)
+        if not items:
+            return []
+        local_scores = self.evaluate_answers_local(items) if mode != EvaluationMode.LLM else [None] * len(items)
+        if mode == EvaluationMode.LOCAL:
+            return local_scores
+
+        prompt_items = [
+            BATCH_EVALUATION_ITEM.format(
+                index=index,
+                interview_type=InterviewType(item["interview_type"]).value,
+                question=item["question"],
+                answer=item["answer"],
+                baseline=local_baseline(local_scores[index])
+            )
+            for index, item in enumerate(items)
+        ]
+        batches = self._pack_batches(prompt_items)
+        responses = await self.gather(
+            [lambda indices=indices: self._evaluate_batch_with_llm(prompt_items, indices) for indices in batches],
+            fallback=lambda i, e: {}
+        )
+
+        parsed = {}
+        for response in responses:
+            parsed.update(response)
+
+        evaluations = []
+        for index, local in enumerate(local_scores):
+            if index in parsed:
+                evaluations.append(merge_llm_evaluation(parsed[index], local))
+            elif local is not None:
+                evaluations.append(local)
+            else:
+                evaluations.append({**default_evaluation(), "fallback": True})
+        return evaluations
+
+    @instrumented
+    async def evaluate_and_generate_next(
+        self,
+        question: str,
+        answer: str,
+        interview_type: InterviewType,
+        previous_answers: List[Dict[str, Any]],
+        next_question_number: Optional[int],
+        focus_area: Optional[str] = None,
+        speculative_question: Optional[Callable[[], Awaitable[dict]]] = None,
+        release_speculative: Optional[Callable[[dict], Awaitable[None]]] = None,
+        on_evaluation: Optional[Callable[[dict], Awaitable[None]]] = None
+    ):
+        # Evaluation and next-question generation are independent unless the
+        # evaluation is poor enough to warrant a follow-up, so the next question
+        # is produced speculatively (by speculative_question if given, e.g. a
+        # pre-generated pool, otherwise the model) while the answer is scored.
+        # A discarded speculative question is passed to release_speculative,
+        # if given, so it can be returned to where it came from.
+        # on_evaluation(evaluation) is awaited as soon as the answer is scored,
+        # before waiting on the next question.
+        if next_question_number is None:
+            evaluation = await self.evaluate_answer(question=question, answer=answer, interview_type=interview_type)
+            if on_evaluation is not None:
+                await on_evaluation(evaluation)
+            return evaluation, None
+
+        if speculative_question is None:
+            speculative_question = lambda: self.generate_question(
+                interview_type=interview_type,
+                question_number=next_question_number,
+                previous_answers=previous_answers,
+                focus_area=focus_area
+            )
+        speculative = asyncio.create_task(speculative_question())
+        try:
+            evaluation = await self.evaluate_answer(question=question, answer=answer, interview_type=interview_type)
+            if on_evaluation is not None:
+                await on_evaluation(evaluation)
+        except BaseException:
+            # A speculative question that is already there is handed back;
+            # one still being produced is cancelled.
+            ready = speculative.done() and not speculative.cancelled() and speculative.exception() is None
+            if ready and release_speculative is not None:
+                run_in_background(release_speculative(speculative.result()))
+            speculative.cancel()
+            raise
+
+        if not needs_adaptive_follow_up(evaluation):
+            try:
+                next_question = await speculative
+                self.stats["speculative_used"] += 1
+                return evaluation, next_question
+            except Exception as e:
+                logger.warning(f"Speculative question generation failed: {e!r}")
+                self.stats["speculative_failed"] += 1
+        else:
+            self.stats["speculative_discarded"] += 1
+            if release_speculative is None:
+                speculative.cancel()
+            else:
+                try:
+                    await release_speculative(await speculative)
+                except Exception as e:
+                    logger.warning(f"Releasing the speculative question failed: {e!r}")
+
+        answered = {"question": question, "answer": answer, "evaluation": evaluation}
+        next_question = await self.generate_question(
+            interview_type=interview_type,
+            question_number=next_question_number,
+            previous_answers=previous_answers + [answered],
+            focus_area=focus_area
+        )
+        return evaluation, next_question
@@ -0,0 +1,349 @@
+import os
+import re
+import sys
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from pymongo.errors import DuplicateKeyError
+
+# Completed interviews kept per user for the growth chart and history list.
+ROLLUP_HISTORY_LIMIT = int(os.environ.get("ROLLUP_HISTORY_LIMIT", "100"))
+DIMENSIONS = ("clarity", "confidence", "structure", "relevance")
+# Interview ids remembered per user and per insight day, so a stats step that
+# is retried after it already wrote is recognised and skipped.
+APPLIED_INTERVIEWS_LIMIT = int(os.environ.get("APPLIED_INTERVIEWS_LIMIT", "200"))
+# Weak areas and failed questions kept per insight day. Both are keyed by free
+# text (model labels, generated questions), so the rarest entries are dropped.
+INSIGHT_BUCKET_MAX_ENTRIES = int(os.environ.get("INSIGHT_BUCKET_MAX_ENTRIES", "200"))
+
+
+def weakness_key(area: str) -> str:
+    # Weakness labels can be free text from the model; hash them so dots and
+    # dollar signs never end up in a field path.
+    return hashlib.sha1(area.encode("utf-8")).hexdigest()[:16]
+
+
+async def upsert_once(collection, query: dict, update: dict):
+    # query carries a "not applied yet" guard on a uniquely keyed document.
+    # When the guard fails on an existing document the upsert collides with
+    # that key and nothing is written; the retry without upsert still applies
+    # the update if the collision was a concurrent first insert instead.
+    try:
+        await collection.update_one(query, update, upsert=True)
+    except DuplicateKeyError:
+        await collection.update_one(query, update)
+
+
+def confidence_band(confidence: float) -> str:
+    if confidence >= 8:
+        return "high"
+    if confidence >= 5:
+        return "medium"
+    return "low"
+
+
+class UserRollups:
+    # One user_analytics document per user, updated with $inc/$push as each
+    # interview completes, so analytics endpoints read it instead of
+    # rescanning interviews and answers.
+
+    def __init__(self, db, history_limit: int = ROLLUP_HISTORY_LIMIT):
+        self.collection = db.user_analytics
+        self.history_limit = history_limit
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("user_id", unique=True)
+
+    def _increments(self, interview: dict, overall_score: float, breakdown: Dict[str, float], weaknesses: List[str]) -> dict:
+        # Rounded like the stored evaluation, so a rebuild reproduces the same sums.
+        overall_score = round(overall_score, 2)
+        increments = {
+            "interviews": 1,
+            "score_sum": overall_score,
+            f"by_type.{interview['interview_type']}.count": 1,
+            f"by_type.{interview['interview_type']}.score_sum": overall_score,
+        }
+        for dimension in DIMENSIONS:
+            increments[f"dimension_sums.{dimension}"] = round(breakdown.get(dimension, 0), 2)
+        for area in weaknesses:
+            key = f"weak_areas.{weakness_key(area)}.count"
+            increments[key] = increments.get(key, 0) + 1
+        return increments
+
+    def _history_entry(self, interview: dict, overall_score: float) -> dict:
+        return {
+            "id": interview["id"],
+            "interview_type": interview["interview_type"],
+            "started_at": interview.get("started_at"),
+            "completed_at": interview["completed_at"],
+            "overall_score": round(overall_score, 2)
+        }
+
+    async def apply(self, user_id: str, interview: dict, overall_score: float, breakdown: Dict[str, float], weaknesses: List[str]):
+        # Idempotent: the interview's history entry is pushed in the same
+        # write, so a retry is skipped while it is among the last
+        # history_limit interviews.
+        await upsert_once(
+            self.collection,
+            {"user_id": user_id, "history.id": {"$ne": interview["id"]}},
+            {
+                "$inc": self._increments(interview, overall_score, breakdown, weaknesses),
+                "$set": {
+                    **{f"weak_areas.{weakness_key(area)}.area": area for area in weaknesses},
+                    "updated_at": datetime.now(timezone.utc).isoformat()
+                },
+                "$push": {"history": {
+                    "$each": [self._history_entry(interview, overall_score)],
+                    "$slice": -self.history_limit
+                }}
+            }
+        )
+
+    async def get(self, user_id: str) -> dict:
+        return await self.collection.find_one({"user_id": user_id}, {"_id": 0}) or {"user_id": user_id}
+
+    async def rebuild(self, db, answer_store, user_id: str) -> dict:
+        # Recomputes a rollup from stored evaluations and answers, replacing
+        # whatever drifted copy exists.
+        rollup = {"user_id": user_id, "interviews": 0, "score_sum": 0.0, "by_type": {},
+                  "dimension_sums": {d: 0.0 for d in DIMENSIONS}, "weak_areas": {}, "history": []}
+        interview_ids = []
+        async for interview in db.interviews.find(
+            {"user_id": user_id, "status": "completed"},
+            {"_id": 0, "id": 1, "interview_type": 1, "started_at": 1, "completed_at": 1}
+        ).sort("completed_at", 1):
+            evaluation = await db.evaluations.find_one(
+                {"interview_id": interview["id"], "user_id": user_id},
+                {"_id": 0, "overall_score": 1, "breakdown": 1}
+            )
+            if not evaluation:
+                continue
+            interview_ids.append(interview["id"])
+            rollup["interviews"] += 1
+            rollup["score_sum"] += evaluation["overall_score"]
+            by_type = rollup["by_type"].setdefault(interview["interview_type"], {"count": 0, "score_sum": 0.0})
+            by_type["count"] += 1
+            by_type["score_sum"] += evaluation["overall_score"]
+            for dimension in DIMENSIONS:
+                rollup["dimension_sums"][dimension] += evaluation["breakdown"].get(dimension, 0)
+            rollup["history"].append(self._history_entry(interview, evaluation["overall_score"]))
+
+        for weakness in await answer_store.weakness_counts(interview_ids):
+            rollup["weak_areas"][weakness_key(weakness["area"])] = weakness
+        rollup["history"] = rollup["history"][-self.history_limit:]
+        rollup["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+        await self.collection.replace_one({"user_id": user_id}, rollup, upsert=True)
+        return rollup
+
+
+class InsightBuckets:
+    # Platform-wide insight counters, one insight_buckets document per UTC day
+    # of completion. A window is answered by summing at most one document per
+    # day, however many interviews those days contain.
+
+    # Per-day maps keyed by weakness_key(), with the label field each entry carries.
+    LABELED = {"weak_areas": "area", "failed_questions": "question"}
+
+    def __init__(self, db, max_entries: int = INSIGHT_BUCKET_MAX_ENTRIES):
+        self.collection = db.insight_buckets
+        self.max_entries = max_entries
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("day", unique=True)
+
+    def _update(self, answers: List[dict], interviews: int = 1) -> dict:
+        increments = {"interviews": interviews, "answers": len(answers)}
+        labels = {}
+        for ans in answers:
+            evaluation = ans.get("evaluation", {})
+            weakness = evaluation.get("weakness_identified", "")
+            if weakness:
+                key = f"weak_areas.{weakness_key(weakness)}"
+                increments[f"{key}.count"] = increments.get(f"{key}.count", 0) + 1
+                labels[f"{key}.area"] = weakness
+            if ans.get("score", 0) < 5:
+                question = ans.get("question", "Unknown Question")
+                key = f"failed_questions.{weakness_key(question)}"
+                increments[f"{key}.count"] = increments.get(f"{key}.count", 0) + 1
+                labels[f"{key}.question"] = question
+            band = f"confidence.{confidence_band(evaluation.get('confidence', 0))}"
+            increments[band] = increments.get(band, 0) + 1
+        return {"$inc": increments, "$set": {**labels, "updated_at": datetime.now(timezone.utc).isoformat()}}
+
+    @staticmethod
+    def merge(target: dict, update: dict):
+        # Adds one _update() into another, as if both had been applied.
+        for key, value in update["$inc"].items():
+            target["$inc"][key] = target["$inc"].get(key, 0) + value
+        target["$set"].update(update["$set"])
+
+    def _overflow(self, counts: Dict[str, int]) -> List[str]:
+        # Keys outside the max_entries most frequent ones.
+        ranked = sorted(counts, key=counts.get, reverse=True)
+        return ranked[self.max_entries:]
+
+    def _trim(self, update: dict):
+        # Drops overflowing entries from a merged _update() before it is written.
+        for field, label in self.LABELED.items():
+            counts = {
+                key.split(".")[1]: value for key, value in update["$inc"].items()
+                if key.startswith(f"{field}.")
+            }
+            for key in self._overflow(counts):
+                del update["$inc"][f"{field}.{key}.count"]
+                update["$set"].pop(f"{field}.{key}.{label}", None)
+
+    async def _compact(self, day: str):
+        # Lets a map grow to twice max_entries before cutting it back, so the
+        # extra write is paid once per max_entries new labels rather than per
+        # completion. Counts of dropped entries are lost; the kept ones are
+        # exact, which is what the top-N summaries read.
+        bucket = await self.collection.find_one({"day": day}, {"_id": 0, **{field: 1 for field in self.LABELED}})
+        unset = {}
+        for field in self.LABELED:
+            entries = (bucket or {}).get(field, {})
+            if len(entries) > 2 * self.max_entries:
+                counts = {key: entry.get("count", 0) for key, entry in entries.items()}
+                unset.update({f"{field}.{key}": "" for key in self._overflow(counts)})
+        if unset:
+            await self.collection.update_one({"day": day}, {"$unset": unset})
+
+    async def apply(self, interview_id: str, completed_at: str, answers: List[dict]):
+        # Idempotent like UserRollups.apply: the interview id is recorded in
+        # the day's bucket by the same write that counts it.
+        update = self._update(answers)
+        update["$push"] = {"applied_interviews": {"$each": [interview_id], "$slice": -APPLIED_INTERVIEWS_LIMIT}}
+        await upsert_once(
+            self.collection,
+            {"day": completed_at[:10], "applied_interviews": {"$ne": interview_id}},
+            update
+        )
+        if any(key.split(".")[0] in self.LABELED for key in update["$inc"]):
+            await self._compact(completed_at[:10])
+
+    async def summarize(self, start: Optional[str], end: Optional[str]) -> dict:
+        day_range = {}
+        if start:
+            day_range["$gte"] = start
+        if end:
+            day_range["$lte"] = end
+        weak_areas, failed_questions = {}, {}
+        confidence = {"high": 0, "medium": 0, "low": 0}
+        interviews = 0
+        async for bucket in self.collection.find({"day": day_range} if day_range else {}, {"_id": 0, "applied_interviews": 0}):
+            interviews += bucket.get("interviews", 0)
+            for band, count in bucket.get("confidence", {}).items():
+                confidence[band] = confidence.get(band, 0) + count
+            for key, entry in bucket.get("weak_areas", {}).items():
+                weak_areas.setdefault(key, {"area": entry["area"], "count": 0})["count"] += entry["count"]
+            for key, entry in bucket.get("failed_questions", {}).items():
+                failed_questions.setdefault(key, {"question": entry["question"], "count": 0})["count"] += entry["count"]
+
+        common_mistakes = sorted(weak_areas.values(), key=lambda w: w["count"], reverse=True)[:10]
+        most_failed = sorted(failed_questions.values(), key=lambda q: q["count"], reverse=True)[:5]
+        return {
+            "common_mistakes": [{"mistake": w["area"], "frequency": w["count"]} for w in common_mistakes],
+            "most_failed_questions": most_failed,
+            "confidence_distribution": confidence,
+            "total_interviews": interviews
+        }
+
+    async def rebuild(self, db, answer_store, batch_size: int = 500, only_days: Optional[List[str]] = None) -> int:
+        # Recomputes every bucket (or just only_days, e.g. after answers were
+        # re-graded) from completed interviews and their answers. Each batch is
+        # folded into per-day counters, so memory grows with distinct labels
+        # per day rather than with the number of answers.
+        days, applied = {}, {}
+        batch = []
+
+        async def flush():
+            answers = await answer_store.for_interviews(
+                [i["id"] for i in batch],
+                {"interview_id": 1, "question": 1, "score": 1,
+                 "evaluation.weakness_identified": 1, "evaluation.confidence": 1}
+            )
+            by_interview = {}
+            for ans in answers:
+                by_interview.setdefault(ans["interview_id"], []).append(ans)
+            for interview in batch:
+                day = days.setdefault(interview["completed_at"][:10], {"$inc": {}, "$set": {}})
+                self.merge(day, self._update(by_interview.get(interview["id"], [])))
+                applied.setdefault(interview["completed_at"][:10], []).append(interview["id"])
+            batch.clear()
+
+        query = {"status": "completed", "completed_at": {"$type": "string"}}
+        if only_days is not None:
+            if not only_days:
+                return 0
+            query["completed_at"] = {"$regex": "^(" + "|".join(re.escape(day) for day in only_days) + ")"}
+        async for interview in db.interviews.find(query, {"_id": 0, "id": 1, "completed_at": 1}):
+            batch.append(interview)
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+
+        # Reset and refill day by day rather than dropping everything first, so
+        # the endpoint never sees an empty collection mid-rebuild.
+        for day, update in days.items():
+            self._trim(update)
+            update["$set"]["applied_interviews"] = applied[day][-APPLIED_INTERVIEWS_LIMIT:]
+            await self.collection.replace_one({"day": day}, {"day": day}, upsert=True)
+            await self.collection.update_one({"day": day}, update)
+        stale = {"day": {"$nin": list(days)}}
+        if only_days is not None:
+            stale["day"]["$in"] = only_days
+        await self.collection.delete_many(stale)
+        return len(days)
+
+
+def growth_data(rollup: dict) -> List[dict]:
+    return [
+        {"date": entry["completed_at"][:10], "score": entry["overall_score"], "type": entry["interview_type"]}
+        for entry in rollup.get("history", [])
+        if entry.get("overall_score")
+    ]
+
+
+def top_weak_areas(rollup: dict, limit: int) -> List[dict]:
+    areas = sorted(rollup.get("weak_areas", {}).values(), key=lambda w: w["count"], reverse=True)[:limit]
+    return [{"area": w["area"], "count": w["count"]} for w in areas]
+
+
+def averages(rollup: dict) -> dict:
+    count = rollup.get("interviews", 0)
+    return {
+        "by_type": {
+            interview_type: round(t["score_sum"] / t["count"], 2)
+            for interview_type, t in rollup.get("by_type", {}).items() if t["count"]
+        },
+        "dimensions": {
+            dimension: round(rollup.get("dimension_sums", {}).get(dimension, 0) / count, 2) if count else 0
+            for dimension in DIMENSIONS
+        }
+    }
+
+
+async def main(argv):
+    from server import db, answer_store, user_rollups, insight_buckets
+
+    if "--insights" in argv:
+        await insight_buckets.ensure_indexes()
+        days = await insight_buckets.rebuild(db, answer_store)
+        print(f"Rebuilt insight buckets for {days} days")
+        return 0
+
+    await user_rollups.ensure_indexes()
+    user_ids: Optional[List[str]] = argv or None
+    if user_ids is None:
+        user_ids = [u["id"] async for u in db.users.find({}, {"_id": 0, "id": 1})]
+    for user_id in user_ids:
+        await user_rollups.rebuild(db, answer_store, user_id)
+    print(f"Rebuilt analytics rollups for {len(user_ids)} users")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
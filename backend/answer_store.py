@@ -0,0 +1,121 @@
+import sys
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 200
+
+
+class AnswerStore:
+    # Answers live in their own collection, one document per (interview_id,
+    # number), so interview documents stay a small header plus the questions.
+    # The unique key is also what rejects a second answer to the same question.
+
+    def __init__(self, db):
+        self.collection = db.interview_answers
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("interview_id", 1), ("number", 1)], unique=True)
+        await self.collection.create_index([("interview_id", 1), ("question_id", 1)], unique=True)
+
+    async def insert(self, interview_id: str, user_id: str, number: int, answer: dict):
+        # Raises DuplicateKeyError when this question (or slot) is already answered.
+        await self.collection.insert_one({
+            "interview_id": interview_id,
+            "user_id": user_id,
+            "number": number,
+            **answer
+        })
+
+    async def insert_many(self, interview_id: str, user_id: str, answers: List[Tuple[int, dict]]):
+        # Ordered, so nothing after a duplicate is written; raises BulkWriteError.
+        await self.collection.insert_many([
+            {"interview_id": interview_id, "user_id": user_id, "number": number, **answer}
+            for number, answer in answers
+        ])
+
+    async def get(self, interview_id: str, number: int) -> Optional[dict]:
+        return await self.collection.find_one({"interview_id": interview_id, "number": number}, {"_id": 0})
+
+    async def list(self, interview_id: str, projection: Optional[dict] = None) -> List[dict]:
+        return await self.collection.find(
+            {"interview_id": interview_id},
+            {"_id": 0, **(projection or {})}
+        ).sort("number", 1).to_list(None)
+
+    async def for_interviews(self, interview_ids: List[str], projection: Optional[dict] = None) -> List[dict]:
+        if not interview_ids:
+            return []
+        return await self.collection.find(
+            {"interview_id": {"$in": interview_ids}},
+            {"_id": 0, **(projection or {})}
+        ).to_list(None)
+
+    async def weakness_counts(self, interview_ids: List[str], limit: Optional[int] = None) -> List[Dict]:
+        # Every distinct weakness when limit is None, most frequent first.
+        if not interview_ids:
+            return []
+        pipeline = [
+            {"$match": {"interview_id": {"$in": interview_ids}, "evaluation.weakness_identified": {"$nin": ["", None]}}},
+            {"$group": {"_id": "$evaluation.weakness_identified", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+        pipeline.append({"$project": {"_id": 0, "area": "$_id", "count": 1}})
+        return await self.collection.aggregate(pipeline).to_list(None)
+
+
+async def migrate_embedded_answers(db, store: AnswerStore, batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    # Moves answers embedded in interview documents into interview_answers and
+    # leaves an answer_count on the header. Each interview is upserted then
+    # unset, so the migration can be interrupted and re-run safely.
+    migrated = 0
+    while True:
+        interviews = await db.interviews.find(
+            {"answers": {"$exists": True}},
+            {"_id": 0, "id": 1, "user_id": 1, "questions": 1, "answers": 1}
+        ).to_list(batch_size)
+        if not interviews:
+            return migrated
+
+        for interview in interviews:
+            numbers = {q["id"]: q["number"] for q in interview.get("questions", [])}
+            answers = interview.get("answers") or []
+            operations = []
+            for position, answer in enumerate(answers, start=1):
+                number = numbers.get(answer["question_id"], position)
+                operations.append(UpdateOne(
+                    {"interview_id": interview["id"], "number": number},
+                    {"$setOnInsert": {
+                        "interview_id": interview["id"],
+                        "user_id": interview["user_id"],
+                        "number": number,
+                        **answer
+                    }},
+                    upsert=True
+                ))
+            if operations:
+                await store.collection.bulk_write(operations, ordered=False)
+            await db.interviews.update_one(
+                {"id": interview["id"]},
+                {"$set": {"answer_count": len(answers)}, "$unset": {"answers": ""}}
+            )
+            migrated += 1
+        logger.info(f"Migrated answers for {migrated} interviews")
+
+
+async def main(argv):
+    from server import db, answer_store
+
+    await answer_store.ensure_indexes()
+    migrated = await migrate_embedded_answers(db, answer_store)
+    print(f"Moved embedded answers out of {migrated} interviews")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
@@ -0,0 +1,117 @@
+import os
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Imports `server` in fresh interpreters under -X importtime and reports what
+# a serverless cold start pays before the first request. In cold-start mode
+# the modules in --forbid must stay out of the import graph; a regression
+# there, or a median import time over --budget-ms, exits non-zero.
+
+CHILD = """
+import time
+started = time.perf_counter()
+import server
+print(round((time.perf_counter() - started) * 1000, 2))
+"""
+
+
+def parse_importtime(stderr: str) -> list:
+    # Lines look like "import time:  self [us] | cumulative | imported package".
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000
+        })
+    return modules
+
+
+def import_once(cold_start: bool) -> dict:
+    env = {
+        **os.environ,
+        "COLD_START_MODE": "true" if cold_start else "false",
+        "MONGO_URL": os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return {"wall_ms": float(result.stdout.strip().splitlines()[-1]), "modules": parse_importtime(result.stderr)}
+
+
+def by_package(modules: list) -> dict:
+    totals = {}
+    for module in modules:
+        package = module["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + module["self_ms"]
+    return totals
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Import-time profile of the API cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", choices=["cold", "eager"], default="cold")
+    parser.add_argument("--forbid", default="numpy,httpx,ai_service,local_scorer,dedup,resilience",
+                        help="Comma-separated modules a cold start must not import")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the median import time exceeds this")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default="cold-start.json")
+    args = parser.parse_args(argv)
+
+    cold_start = args.mode == "cold"
+    # The first run also compiles bytecode for anything stale; keep it out of the figures.
+    import_once(cold_start)
+    runs = [import_once(cold_start) for _ in range(args.runs)]
+
+    wall = statistics.median(run["wall_ms"] for run in runs)
+    packages = {}
+    for run in runs:
+        for package, ms in by_package(run["modules"]).items():
+            packages.setdefault(package, []).append(ms)
+    packages = {package: round(statistics.median(samples), 2) for package, samples in packages.items()}
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    imported = {module["module"] for module in runs[-1]["modules"]}
+    forbidden = sorted(m for m in args.forbid.split(",") if m and m in imported) if cold_start else []
+
+    report = {
+        "python": platform.python_version(),
+        "mode": args.mode,
+        "runs": args.runs,
+        "import_ms_median": round(wall, 2),
+        "import_ms_runs": [run["wall_ms"] for run in runs],
+        "modules_imported": len(imported),
+        "packages_self_ms": dict(top),
+        "forbidden_imported": forbidden,
+        "budget_ms": args.budget_ms,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2, sort_keys=True))
+
+    print(f"import server ({args.mode}): median {wall:.1f} ms over {args.runs} runs, {len(imported)} modules")
+    for package, ms in top:
+        print(f"  {package:30} {ms:8.1f} ms")
+    print(f"Results written to {args.output}")
+
+    failed = False
+    if forbidden:
+        print(f"Cold start imported: {', '.join(forbidden)}")
+        failed = True
+    if args.budget_ms is not None and wall > args.budget_ms:
+        print(f"Median import time {wall:.1f} ms exceeds the {args.budget_ms:.1f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,296 @@
+import os
+import sys
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import InterviewType, ReadinessStatus, Role  # noqa: E402
+from question_bank import QUESTION_BANK  # noqa: E402
+from local_scorer import WEAKNESS_LABELS  # noqa: E402
+from analytics import DIMENSIONS, ROLLUP_HISTORY_LIMIT, weakness_key  # noqa: E402
+
+# Bulk-loads synthetic users, interviews, interview_answers, evaluations and
+# the user_analytics / insight_buckets rollups derived from them, in the
+# shapes server.py writes, so admin and analytics endpoints can be measured
+# at production scale. Every user shares one password (--password).
+
+ANSWERS = [
+    "In my last role I led a team of four to rebuild our billing service and cut incidents by 40%.",
+    "I think I am good at many things, maybe communication, and I work hard.",
+    "First I clarify the requirements, break the problem down and measure the outcome against the goal.",
+    "I handled the conflict by listening to both sides and agreeing on a plan we could all support.",
+]
+FOCUS_AREAS = [None, None, None, "leadership", "system design", "communication", "problem solving"]
+
+
+def parse_weights(value: str) -> dict:
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        weights[InterviewType(name.strip()).value] = float(weight)
+    return weights
+
+
+def readiness(score: float) -> str:
+    if score >= 8.0:
+        return ReadinessStatus.READY.value
+    if score >= 6.0:
+        return ReadinessStatus.NEEDS_PRACTICE.value
+    return ReadinessStatus.NOT_READY.value
+
+
+class Generator:
+    def __init__(self, args, password_hash: str, now: datetime, insight_buckets):
+        self.args = args
+        self.password_hash = password_hash
+        self.now = now
+        self.random = random.Random(args.seed)
+        self.types = list(args.type_weights)
+        self.type_weights = list(args.type_weights.values())
+        # Per-day insight_buckets updates, merged across interviews.
+        self.buckets = {}
+        self.insight_buckets = insight_buckets
+
+    def _clip(self, value: float) -> float:
+        return round(min(10.0, max(0.0, value)), 1)
+
+    def _evaluation(self, skill: float) -> dict:
+        dimensions = {d: self._clip(self.random.gauss(skill, self.args.answer_stddev)) for d in DIMENSIONS}
+        weakest = min(dimensions, key=dimensions.get)
+        return {
+            "score": round(sum(dimensions.values()) / len(dimensions), 1),
+            **dimensions,
+            "weakness_identified": WEAKNESS_LABELS[weakest] if dimensions[weakest] < 7.0 else "",
+            "feedback": ""
+        }
+
+    def _bucket(self, day: str, answers: list):
+        bucket = self.buckets.setdefault(day, {"$inc": {}, "$set": {}})
+        self.insight_buckets.merge(bucket, self.insight_buckets._update(answers))
+
+    def _interview_count(self) -> int:
+        # Lognormal with the requested mean: most users do a few interviews, a
+        # long tail does many.
+        sigma = self.args.activity_skew
+        mu = -sigma * sigma / 2
+        return max(0, round(self.random.lognormvariate(mu, sigma) * self.args.interviews_per_user))
+
+    def user(self, index: int) -> dict:
+        # Returns {collection: [documents]} for one user and their history.
+        args, rng = self.args, self.random
+        user_id = str(uuid.uuid4())
+        created_at = self.now - timedelta(days=rng.uniform(0, args.days))
+        count = self._interview_count()
+        in_progress = count > 0 and rng.random() < args.in_progress_rate
+        skill = min(10.0, max(1.0, rng.gauss(args.score_mean, args.score_stddev)))
+
+        starts = sorted(created_at + (self.now - created_at) * rng.random() for _ in range(count))
+        docs = {"users": [], "interviews": [], "interview_answers": [], "evaluations": [], "user_analytics": []}
+        rollup = {"user_id": user_id, "interviews": 0, "score_sum": 0.0, "by_type": {},
+                  "dimension_sums": {d: 0.0 for d in DIMENSIONS}, "weak_areas": {}, "history": []}
+        last_score = None
+
+        for position, started in enumerate(starts):
+            interview_id = str(uuid.uuid4())
+            interview_type = rng.choices(self.types, self.type_weights)[0]
+            bank = QUESTION_BANK[InterviewType(interview_type)]
+            completed = not (in_progress and position == count - 1)
+            answer_count = 5 if completed else rng.randint(0, 4)
+            question_count = 5 if completed else answer_count + 1
+
+            questions = []
+            for number in range(1, question_count + 1):
+                questions.append({
+                    "id": str(uuid.uuid4()),
+                    "question": bank[(number - 1 + position) % len(bank)]["question"],
+                    "difficulty": rng.choice(["easy", "medium", "medium", "hard"]),
+                    "number": number
+                })
+
+            answers = []
+            for number, question in enumerate(questions[:answer_count], start=1):
+                evaluation = self._evaluation(skill)
+                answers.append({
+                    "interview_id": interview_id,
+                    "user_id": user_id,
+                    "number": number,
+                    "question_id": question["id"],
+                    "question": question["question"],
+                    "answer": rng.choice(ANSWERS),
+                    "score": evaluation["score"],
+                    "evaluation": evaluation,
+                    "submitted_at": (started + timedelta(minutes=3 * number)).isoformat()
+                })
+            docs["interview_answers"].extend(answers)
+
+            interview = {
+                "id": interview_id,
+                "user_id": user_id,
+                "interview_type": interview_type,
+                "focus_area": rng.choice(FOCUS_AREAS),
+                "status": "in_progress",
+                "started_at": started.isoformat(),
+                "completed_at": None,
+                "overall_score": None,
+                "questions": questions,
+                "answer_count": answer_count
+            }
+            docs["interviews"].append(interview)
+            skill = min(10.0, skill + args.improvement)
+            if not completed:
+                continue
+
+            overall_score = sum(a["score"] for a in answers) / len(answers)
+            breakdown = {d: round(sum(a["evaluation"][d] for a in answers) / len(answers), 2) for d in DIMENSIONS}
+            completed_at = (started + timedelta(minutes=rng.uniform(15, 40))).isoformat()
+            interview.update({
+                "status": "completed",
+                "completed_at": completed_at,
+                "overall_score": round(overall_score, 2),
+                "stats_applied": True
+            })
+            strengths = [f"Strong {d}" for d, value in breakdown.items() if value >= 8.0]
+            docs["evaluations"].append({
+                "id": str(uuid.uuid4()),
+                "interview_id": interview_id,
+                "user_id": user_id,
+                "overall_score": round(overall_score, 2),
+                "breakdown": breakdown,
+                "strengths": strengths or ["Completed the interview", "Attempted all questions"],
+                "mistakes": [],
+                "improvement_tips": ["Practice STAR method", "Use specific examples", "Be concise and structured"],
+                "readiness_flag": readiness(overall_score),
+                "created_at": completed_at
+            })
+
+            # Same sums UserRollups.rebuild would compute.
+            rollup["interviews"] += 1
+            rollup["score_sum"] += round(overall_score, 2)
+            by_type = rollup["by_type"].setdefault(interview_type, {"count": 0, "score_sum": 0.0})
+            by_type["count"] += 1
+            by_type["score_sum"] += round(overall_score, 2)
+            for dimension in DIMENSIONS:
+                rollup["dimension_sums"][dimension] += breakdown[dimension]
+            for ans in answers:
+                area = ans["evaluation"]["weakness_identified"]
+                if area:
+                    rollup["weak_areas"].setdefault(weakness_key(area), {"area": area, "count": 0})["count"] += 1
+            rollup["history"].append({
+                "id": interview_id,
+                "interview_type": interview_type,
+                "started_at": interview["started_at"],
+                "completed_at": completed_at,
+                "overall_score": round(overall_score, 2)
+            })
+            self._bucket(completed_at[:10], answers)
+            last_score = overall_score
+
+        last_active = starts[-1] if starts else created_at
+        docs["users"].append({
+            "id": user_id,
+            "email": f"{args.prefix}-{index}@example.com",
+            "password": self.password_hash,
+            "name": f"Synthetic User {index}",
+            "role": Role.USER.value,
+            "created_at": created_at.isoformat(),
+            "last_login": last_active.isoformat(),
+            "last_login_at": last_active,
+            "total_interviews": rollup["interviews"],
+            "average_score": round(rollup["score_sum"] / rollup["interviews"], 2) if rollup["interviews"] else 0.0,
+            "streak": 0,
+            "readiness_status": readiness(last_score) if last_score is not None else ReadinessStatus.NOT_READY.value
+        })
+        if rollup["interviews"]:
+            rollup["history"] = rollup["history"][-ROLLUP_HISTORY_LIMIT:]
+            rollup["updated_at"] = self.now.isoformat()
+            docs["user_analytics"].append(rollup)
+        return docs
+
+
+class BulkWriter:
+    # Buffers documents per collection and writes them with unordered
+    # insert_many once a batch fills up.
+
+    def __init__(self, db, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.pending = {}
+        self.written = {}
+
+    async def add(self, collection: str, documents: list):
+        buffer = self.pending.setdefault(collection, [])
+        buffer.extend(documents)
+        if len(buffer) >= self.batch_size:
+            await self.flush(collection)
+
+    async def flush(self, collection: str):
+        buffer = self.pending.get(collection)
+        if buffer:
+            self.pending[collection] = []
+            await self.db[collection].insert_many(buffer, ordered=False)
+            self.written[collection] = self.written.get(collection, 0) + len(buffer)
+
+    async def flush_all(self):
+        await asyncio.gather(*[self.flush(collection) for collection in list(self.pending)])
+
+
+async def main(argv):
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic users, interviews and analytics")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--interviews-per-user", type=float, default=5.0, help="Mean interviews per user")
+    parser.add_argument("--activity-skew", type=float, default=1.0,
+                        help="Lognormal sigma of interviews per user; 0 gives every user the mean")
+    parser.add_argument("--in-progress-rate", type=float, default=0.1,
+                        help="Fraction of active users whose latest interview is unfinished")
+    parser.add_argument("--score-mean", type=float, default=6.5, help="Mean starting skill on the 0-10 scale")
+    parser.add_argument("--score-stddev", type=float, default=1.5, help="Spread of skill across users")
+    parser.add_argument("--answer-stddev", type=float, default=1.0, help="Spread of dimension scores per answer")
+    parser.add_argument("--improvement", type=float, default=0.05, help="Skill gained per interview")
+    parser.add_argument("--type-weights", type=parse_weights, default=parse_weights("HR=1,Technical=1,Behavioral=1"))
+    parser.add_argument("--days", type=int, default=365, help="Spread activity over this many past days")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--prefix", default="synthetic", help="Email prefix; change it to load another cohort")
+    parser.add_argument("--password", default="synthetic-password")
+    parser.add_argument("--mongo-url", help="Defaults to MONGO_URL")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if args.mongo_url:
+        os.environ["MONGO_URL"] = args.mongo_url
+    from server import db, hash_password, insight_buckets
+    import indexes
+
+    generator = Generator(args, await hash_password(args.password), datetime.now(timezone.utc), insight_buckets)
+    writer = BulkWriter(db, args.batch_size)
+    started = time.perf_counter()
+
+    for index in range(args.users):
+        for collection, documents in generator.user(index).items():
+            await writer.add(collection, documents)
+        if (index + 1) % 10000 == 0:
+            print(f"{index + 1} users generated in {time.perf_counter() - started:.1f}s")
+    await writer.flush_all()
+
+    # Added to whatever the buckets already hold, like InsightBuckets.apply.
+    for day, update in generator.buckets.items():
+        await db.insight_buckets.update_one({"day": day}, update, upsert=True)
+
+    # Indexes are built after the load; maintaining them per insert is slower.
+    await indexes.main([])
+
+    elapsed = time.perf_counter() - started
+    for collection, count in sorted(writer.written.items()):
+        print(f"  {collection:20} {count}")
+    print(f"  {'insight_buckets':20} {len(generator.buckets)} days")
+    print(f"Generated {args.users} users in {elapsed:.1f}s; password: {args.password}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
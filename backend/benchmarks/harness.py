@@ -0,0 +1,100 @@
+import os
+import re
+import sys
+import json
+import random
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Boots server.app in-process for benchmarks: against a real mongod when
+# --mongo-url is given, otherwise against mongomock-motor (a dev-only
+# dependency, not in requirements.txt), with the model provider replaced by
+# FakeProvider.
+
+
+class FakeProvider:
+    # Stands in for the chat completions API behind AIService: lognormal
+    # latency around `latency` seconds, plus uniform jitter and an error rate.
+
+    def __init__(self, latency: float = 0.8, jitter: float = 0.2, error_rate: float = 0.0, seed: int = 1):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stats = {"calls": 0, "errors": 0}
+
+    async def _delay(self):
+        self.stats["calls"] += 1
+        if self.latency > 0:
+            delay = self.random.lognormvariate(0, 0.35) * self.latency + self.random.uniform(0, self.jitter)
+            await asyncio.sleep(delay)
+        if self.random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            raise RuntimeError("fake provider error")
+
+    def _content(self, prompt: str) -> str:
+        scores = {k: round(self.random.uniform(4, 9.5), 1) for k in ("clarity", "confidence", "structure", "relevance")}
+        scores["score"] = round(sum(scores.values()) / 4, 1)
+        if prompt.startswith("You are conducting"):
+            number = re.search(r"question number (\d+)", prompt)
+            return json.dumps({
+                "question": f"Benchmark question {number.group(1) if number else 1}: describe a project you are proud of.",
+                "difficulty": "medium"
+            })
+        if prompt.startswith("You are evaluating interview answers"):
+            indices = [int(i) for i in re.findall(r"^Item (\d+) ", prompt, re.MULTILINE)]
+            return json.dumps({"results": [{"index": i, **scores, "weakness_identified": "Lack of structure",
+                                            "feedback": "Add a result."} for i in indices]})
+        if prompt.startswith("You are evaluating"):
+            return json.dumps({**scores, "weakness_identified": "Lack of structure", "feedback": "Add a result."})
+        return json.dumps({
+            "improved_answer": "In my last role I led the migration, cut latency by 30% and documented the outcome.",
+            "why_improved": "Specific, structured and quantified.",
+            "mistakes": [{"what_went_wrong": "No measurable result", "correction": "Quantify the outcome"}],
+            "tips": ["Use the STAR method"]
+        })
+
+    async def generate_response(self, prompt: str) -> str:
+        await self._delay()
+        return self._content(prompt)
+
+    async def stream_response(self, prompt: str):
+        await self._delay()
+        content = json.loads(self._content(prompt))
+        improved = content.pop("improved_answer", "")
+        for word in improved.split(" "):
+            yield word + " "
+        yield "\n---JSON---\n" + json.dumps(content)
+
+
+def configure_environment(mongo_url=None, bcrypt_rounds=None):
+    # Must run before server is imported: it reads its configuration at import.
+    if bcrypt_rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(bcrypt_rounds)
+    if mongo_url:
+        os.environ["MONGO_URL"] = mongo_url
+        return
+    os.environ.setdefault("MONGO_URL", "mongodb://benchmark")
+    import motor.motor_asyncio
+    from mongomock_motor import AsyncMongoMockClient
+    motor.motor_asyncio.AsyncIOMotorClient = AsyncMongoMockClient
+
+
+@asynccontextmanager
+async def booted_app(provider: FakeProvider, mongo_url=None, bcrypt_rounds=None):
+    configure_environment(mongo_url, bcrypt_rounds)
+    import server
+
+    server.ai_service.generate_response = provider.generate_response
+    server.ai_service.stream_response = provider.stream_response
+    if mongo_url:
+        # A real database may hold data from an earlier run.
+        await server.db.client.drop_database(server.db.name)
+    await server.startup_event()
+    try:
+        yield server
+    finally:
+        await server.shutdown_db_client()
@@ -0,0 +1,173 @@
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from pathlib import Path
+import httpx
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.harness import FakeProvider, booted_app  # noqa: E402
+
+ANSWERS = [
+    "In my last role I led a team of four to rebuild our billing service. The task was to cut failures; "
+    "I added retries and monitoring, and as a result incidents dropped by 40%.",
+    "I think I am good at many things, maybe communication, and I work hard.",
+    "First I clarify the requirements, then I break the problem down, implement the simplest version, "
+    "and finally measure the outcome against the goal we agreed on.",
+]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    async def call(self, name: str, request):
+        started = time.perf_counter()
+        try:
+            response = await request
+        except Exception:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            raise
+        self.samples.setdefault(name, []).append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            response.raise_for_status()
+        return response
+
+    def summary(self) -> dict:
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            ms = np.array(samples) * 1000
+            endpoints[name] = {
+                "count": len(samples),
+                "errors": self.errors.get(name, 0),
+                "mean_ms": round(float(ms.mean()), 2),
+                "p50_ms": round(float(np.percentile(ms, 50)), 2),
+                "p95_ms": round(float(np.percentile(ms, 95)), 2),
+                "p99_ms": round(float(np.percentile(ms, 99)), 2),
+            }
+        return endpoints
+
+
+async def journey(client: httpx.AsyncClient, recorder: Recorder, index: int, rng: random.Random, completion: str):
+    # signup -> start -> 5x answer -> complete -> evaluation -> dashboard
+    response = await recorder.call("POST /auth/signup", client.post("/api/auth/signup", json={
+        "email": f"bench-{index}-{rng.getrandbits(32)}@example.com",
+        "password": "benchmark-password",
+        "name": f"Bench {index}",
+        "consent": True
+    }))
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await recorder.call("POST /interviews/start", client.post(
+        "/api/interviews/start",
+        json={"interview_type": rng.choice(["HR", "Technical", "Behavioral"])},
+        headers=headers
+    ))
+    interview = response.json()
+    question = interview["questions"][0]
+
+    for _ in range(5):
+        response = await recorder.call("POST /interviews/answer", client.post("/api/interviews/answer", json={
+            "interview_id": interview["id"],
+            "question_id": question["id"],
+            "answer_text": rng.choice(ANSWERS)
+        }, headers=headers))
+        question = response.json().get("next_question")
+
+    if completion == "async":
+        response = await recorder.call("POST /interviews/{id}/complete/async", client.post(
+            f"/api/interviews/{interview['id']}/complete/async", headers=headers
+        ))
+        job_url = response.json()["status_url"]
+        while True:
+            job = (await recorder.call("GET /interviews/jobs/{id}", client.get(job_url, headers=headers))).json()
+            if job["status"] in ("succeeded", "failed"):
+                break
+            await asyncio.sleep(0.05)
+    else:
+        await recorder.call("POST /interviews/{id}/complete", client.post(
+            f"/api/interviews/{interview['id']}/complete", headers=headers
+        ))
+
+    await recorder.call("GET /evaluations/{id}", client.get(f"/api/evaluations/{interview['id']}", headers=headers))
+    await recorder.call("GET /analytics/dashboard", client.get("/api/analytics/dashboard", headers=headers))
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main(argv):
+    parser = argparse.ArgumentParser(description="End-to-end load test against an in-process app and fake AI provider")
+    parser.add_argument("--journeys", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2, help="Median fake provider latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Extra uniform latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of provider calls that fail")
+    parser.add_argument("--completion", choices=["sync", "async"], default="sync")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None)
+    parser.add_argument("--mongo-url", help="Use a real MongoDB instead of mongomock-motor")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="benchmark-results.json")
+    args = parser.parse_args(argv)
+
+    provider = FakeProvider(args.latency, args.jitter, args.error_rate, seed=args.seed)
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failed = 0
+
+    async with booted_app(provider, args.mongo_url, args.bcrypt_rounds) as server:
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            async def run(index: int):
+                nonlocal failed
+                async with semaphore:
+                    try:
+                        await journey(client, recorder, index, rng, args.completion)
+                    except Exception:
+                        failed += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*[run(i) for i in range(args.journeys)])
+            elapsed = time.perf_counter() - started
+
+    endpoints = recorder.summary()
+    requests = sum(e["count"] for e in endpoints.values())
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "database": "mongodb" if args.mongo_url else "mongomock",
+        "elapsed_seconds": round(elapsed, 3),
+        "journeys_completed": args.journeys - failed,
+        "journeys_failed": failed,
+        "journeys_per_second": round((args.journeys - failed) / elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 3),
+        "provider": provider.stats,
+        "endpoints": endpoints,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2, sort_keys=True))
+
+    print(f"{report['journeys_completed']}/{args.journeys} journeys in {elapsed:.2f}s "
+          f"({report['requests_per_second']:.1f} req/s)")
+    for name, stats in endpoints.items():
+        print(f"  {name:40} n={stats['count']:5} p50={stats['p50_ms']:8.1f} "
+              f"p95={stats['p95_ms']:8.1f} p99={stats['p99_ms']:8.1f} ms  errors={stats['errors']}")
+    print(f"Results written to {args.output}")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
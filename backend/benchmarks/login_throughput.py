@@ -0,0 +1,96 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+import bcrypt
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import auth  # noqa: E402
+
+# Measures password verification throughput under concurrent logins and how
+# long the event loop stalls meanwhile. "inline" reproduces calling bcrypt
+# directly from a handler; "pool" uses auth.verify_password.
+
+
+async def inline_verify(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+async def heartbeat(stop: asyncio.Event, interval: float, lags: list):
+    # A stand-in for every other request on the worker: how late does a
+    # trivial task get scheduled while logins run?
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def run(mode: str, requests: int, concurrency: int, hashed: str, password: str) -> dict:
+    verify = inline_verify if mode == "inline" else auth.verify_password
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def login():
+        async with semaphore:
+            started = time.perf_counter()
+            assert await verify(password, hashed)
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    lags = []
+    beat = asyncio.create_task(heartbeat(stop, 0.005, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(requests)])
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+
+    lags_ms = np.array(lags or [0.0]) * 1000
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "mode": mode,
+        "requests": requests,
+        "concurrency": concurrency,
+        "logins_per_second": round(requests / elapsed, 2),
+        "login_p50_ms": round(float(np.percentile(latencies_ms, 50)), 2),
+        "login_p99_ms": round(float(np.percentile(latencies_ms, 99)), 2),
+        "loop_lag_p99_ms": round(float(np.percentile(lags_ms, 99)), 2),
+        "loop_lag_max_ms": round(float(lags_ms.max()), 2),
+    }
+
+
+async def main(argv):
+    parser = argparse.ArgumentParser(description="Login (bcrypt verify) throughput and event-loop stall benchmark")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=auth.BCRYPT_ROUNDS)
+    parser.add_argument("--modes", default="inline,pool")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    password = "benchmark-password"
+    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(args.rounds)).decode("utf-8")
+
+    results = []
+    for mode in args.modes.split(","):
+        result = await run(mode, args.requests, args.concurrency, hashed, password)
+        result.update(rounds=args.rounds, bcrypt_threads=auth.BCRYPT_THREADS)
+        results.append(result)
+        print(
+            f"{mode:7} {result['logins_per_second']:8.1f} logins/s  "
+            f"login p99 {result['login_p99_ms']:8.1f} ms  "
+            f"loop lag p99 {result['loop_lag_p99_ms']:7.1f} ms  max {result['loop_lag_max_ms']:7.1f} ms"
+        )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
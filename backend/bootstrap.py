@@ -0,0 +1,53 @@
+import os
+import sys
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timezone
+from models import Role, ReadinessStatus
+from auth import hash_password
+
+logger = logging.getLogger(__name__)
+
+ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "admin@interviewiq.com")
+ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "admin123")
+
+
+async def ensure_default_admin(db, email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> bool:
+    # Returns True when the account was created; an existing one is left as is.
+    if await db.users.find_one({"email": email}, {"_id": 0, "id": 1}):
+        return False
+
+    admin_dict = {
+        "id": str(uuid.uuid4()),
+        "email": email,
+        "password": await hash_password(password),
+        "name": "Platform Admin",
+        "role": Role.ADMIN.value,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "last_login": None,
+        "total_interviews": 0,
+        "average_score": 0.0,
+        "streak": 0,
+        "readiness_status": ReadinessStatus.NOT_READY.value,
+        "consent": True
+    }
+    await db.users.insert_one(admin_dict)
+    logger.info(f"Default admin user created: {email}")
+    return True
+
+
+async def main(argv):
+    # One-time setup for deployments that run in cold-start mode, where the
+    # API itself neither builds indexes nor creates the admin account.
+    import indexes
+    from server import db
+
+    await indexes.main([])
+    created = await ensure_default_admin(db)
+    print(f"Admin account {ADMIN_EMAIL} {'created' if created else 'already exists'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
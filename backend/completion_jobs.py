@@ -0,0 +1,197 @@
+import os
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+COMPLETION_WORKERS = int(os.environ.get("COMPLETION_WORKERS", "4"))
+COMPLETION_MAX_ATTEMPTS = int(os.environ.get("COMPLETION_MAX_ATTEMPTS", "3"))
+COMPLETION_RETRY_DELAY = float(os.environ.get("COMPLETION_RETRY_DELAY", "2"))
+# A queued or running job not updated for this many seconds is presumed
+# orphaned (its process died) and may be taken over by another worker.
+COMPLETION_LEASE = float(os.environ.get("COMPLETION_LEASE", "300"))
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class CompletionQueue:
+    # In-process worker pool for interview completion. Jobs live in the
+    # completion_jobs collection (one per interview), so a restart resumes
+    # queued/running jobs and a repeated request returns the existing job.
+    # updated_at doubles as a lease: a job whose lease expired is re-queued
+    # by the next request for it and may be claimed by any worker.
+
+    def __init__(
+        self,
+        db,
+        handler: Callable[[dict, Callable[..., Awaitable[None]]], Awaitable[str]],
+        workers: int = COMPLETION_WORKERS,
+        max_attempts: int = COMPLETION_MAX_ATTEMPTS,
+        retry_delay: float = COMPLETION_RETRY_DELAY,
+        lease: float = COMPLETION_LEASE
+    ):
+        self.collection = db.completion_jobs
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("id", unique=True)
+        await self.collection.create_index("interview_id", unique=True)
+        await self.collection.create_index("status")
+
+    async def start(self, resume: bool = True):
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        if not resume:
+            return
+        pending = await self.collection.find(
+            {"status": {"$in": [JobStatus.QUEUED, JobStatus.RUNNING]}},
+            {"_id": 0, "id": 1}
+        ).to_list(None)
+        for job in pending:
+            self._queue.put_nowait(job["id"])
+        if pending:
+            logger.info(f"Resumed {len(pending)} interview completion jobs")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def enqueue(self, interview_id: str, user_id: str) -> dict:
+        now = datetime.now(timezone.utc).isoformat()
+        job = {
+            "id": str(uuid.uuid4()),
+            "interview_id": interview_id,
+            "user_id": user_id,
+            "status": JobStatus.QUEUED,
+            "attempts": 0,
+            "progress": None,
+            "evaluation_id": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        try:
+            existing = await self.collection.find_one_and_update(
+                {"interview_id": interview_id},
+                {"$setOnInsert": job},
+                projection={"_id": 0},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent enqueue inserted the job first.
+            existing = await self.collection.find_one({"interview_id": interview_id}, {"_id": 0})
+        if existing is None:
+            self._queue.put_nowait(job["id"])
+            return job
+
+        if existing["status"] in (JobStatus.QUEUED, JobStatus.RUNNING):
+            return await self._reclaim(existing)
+
+        if existing["status"] == JobStatus.FAILED:
+            # An explicit new request gets a fresh set of attempts.
+            existing = await self.collection.find_one_and_update(
+                {"id": existing["id"], "status": JobStatus.FAILED},
+                {"$set": {"status": JobStatus.QUEUED, "attempts": 0, "error": None, "updated_at": now}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            ) or existing
+            if existing["status"] == JobStatus.QUEUED:
+                self._queue.put_nowait(existing["id"])
+        return existing
+
+    def _lease_expired_before(self) -> str:
+        return (datetime.now(timezone.utc) - timedelta(seconds=self.lease)).isoformat()
+
+    async def _reclaim(self, job: dict) -> dict:
+        # Re-queues a queued/running job here if its lease expired, e.g. its
+        # worker's process died or it was only queued in memory elsewhere.
+        now = datetime.now(timezone.utc).isoformat()
+        reclaimed = await self.collection.update_one(
+            {"id": job["id"], "status": {"$in": [JobStatus.QUEUED, JobStatus.RUNNING]},
+             "updated_at": {"$lt": self._lease_expired_before()}},
+            {"$set": {"status": JobStatus.QUEUED, "updated_at": now}}
+        )
+        if reclaimed.modified_count == 0:
+            return job
+        logger.info(f"Reclaimed completion job {job['id']} after its lease expired")
+        self._queue.put_nowait(job["id"])
+        return {**job, "status": JobStatus.QUEUED, "updated_at": now}
+
+    async def get(self, job_id: str, user_id: str) -> Optional[dict]:
+        job = await self.collection.find_one({"id": job_id, "user_id": user_id}, {"_id": 0})
+        if job and job["status"] in (JobStatus.QUEUED, JobStatus.RUNNING):
+            # Polling is what recovers a job orphaned by an instance that died
+            # or was frozen, since instances may start without resuming jobs.
+            job = await self._reclaim(job)
+        return job
+
+    async def _update(self, job_id: str, **fields):
+        fields["updated_at"] = datetime.now(timezone.utc).isoformat()
+        await self.collection.update_one({"id": job_id}, {"$set": fields})
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Completion job {job_id} crashed: {e!r}")
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        now = datetime.now(timezone.utc).isoformat()
+        # A running job is only taken over once its lease expired, so a job
+        # resumed or re-queued by several workers runs once. The claimed
+        # document no longer matches the filter, hence BEFORE.
+        job = await self.collection.find_one_and_update(
+            {"id": job_id, "$or": [
+                {"status": JobStatus.QUEUED},
+                {"status": JobStatus.RUNNING, "updated_at": {"$lt": self._lease_expired_before()}}
+            ]},
+            {"$set": {"status": JobStatus.RUNNING, "updated_at": now}, "$inc": {"attempts": 1}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE
+        )
+        if not job:
+            return
+        job.update(status=JobStatus.RUNNING, updated_at=now, attempts=job["attempts"] + 1)
+
+        async def report(stage: str, completed: int = 0, total: int = 0):
+            await self._update(job_id, progress={"stage": stage, "completed": completed, "total": total})
+
+        try:
+            evaluation_id = await self.handler(job, report)
+        except Exception as e:
+            logger.warning(f"Completion job {job_id} attempt {job['attempts']} failed: {e!r}")
+            if job["attempts"] >= self.max_attempts:
+                await self._update(job_id, status=JobStatus.FAILED, error=str(e))
+                return
+            await self._update(job_id, status=JobStatus.QUEUED, error=str(e))
+            asyncio.get_running_loop().call_later(
+                self.retry_delay * 2 ** (job["attempts"] - 1),
+                self._queue.put_nowait,
+                job_id
+            )
+            return
+
+        await self._update(job_id, status=JobStatus.SUCCEEDED, evaluation_id=evaluation_id, error=None)
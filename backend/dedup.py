@@ -0,0 +1,101 @@
+import re
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import numpy as np
+
+MINHASH_PERMUTATIONS = 64
+SHINGLE_SIZE = 3
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+class SingleFlight:
+    # Concurrent calls with the same key share one execution and its result.
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]):
+        self.stats["calls"] += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            # Shielded so one caller disconnecting does not cancel the shared call.
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(call())
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+    hashes = {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little") for g in grams}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+class MinHashIndex:
+    # Remembers recent results per question and finds a prior answer whose
+    # estimated Jaccard similarity (over word shingles) meets the threshold.
+
+    def __init__(self, threshold: float, max_questions: int = 1024, per_question: int = 50, seed: int = 7):
+        self.threshold = threshold
+        self.max_questions = max_questions
+        self.per_question = per_question
+        rng = np.random.default_rng(seed)
+        # Multipliers and shingle hashes are both below 2**32 so a * h fits in uint64.
+        self._a = rng.integers(1, int(_MAX_HASH), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE_PRIME), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+        self._entries: "OrderedDict[Hashable, list]" = OrderedDict()
+        self.stats = {"lookups": 0, "hits": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return 0 < self.threshold <= 1
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        hashes = shingles(text)
+        if hashes.size == 0:
+            return None
+        # (a * h + b) mod p for every permutation and shingle at once.
+        permuted = (np.outer(self._a, hashes) % _MERSENNE_PRIME + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1)
+
+    def lookup(self, key: Hashable, text: str):
+        if not self.enabled:
+            return None
+        self.stats["lookups"] += 1
+        entries = self._entries.get(key)
+        signature = self.signature(text)
+        if not entries or signature is None:
+            return None
+
+        self._entries.move_to_end(key)
+        signatures = np.stack([s for s, _ in entries])
+        similarity = (signatures == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        if similarity[best] >= self.threshold:
+            self.stats["hits"] += 1
+            return entries[best][1]
+        return None
+
+    def add(self, key: Hashable, text: str, value: Any):
+        if not self.enabled:
+            return
+        signature = self.signature(text)
+        if signature is None:
+            return
+        entries = self._entries.setdefault(key, [])
+        self._entries.move_to_end(key)
+        entries.append((signature, value))
+        del entries[:-self.per_question]
+        while len(self._entries) > self.max_questions:
+            self._entries.popitem(last=False)
@@ -0,0 +1,94 @@
+import os
+import json
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+FEEDBACK_CACHE_SIZE = int(os.environ.get("FEEDBACK_CACHE_SIZE", "2048"))
+
+
+def feedback_cache_key(question: str, answer: str, score: float, version: str) -> str:
+    payload = json.dumps([question, answer, round(float(score), 2), version], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FeedbackCache:
+    # Two tiers: a per-process LRU in front of a Mongo collection shared by all workers.
+
+    def __init__(self, collection, max_entries: int = FEEDBACK_CACHE_SIZE):
+        self.collection = collection
+        self.max_entries = max_entries
+        self._lru = OrderedDict()
+        self.stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("key", unique=True)
+
+    def _remember(self, key: str, feedback: dict):
+        self._lru[key] = feedback
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def get(self, key: str):
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return self._lru[key]
+
+        doc = await self.collection.find_one({"key": key}, {"_id": 0, "feedback": 1})
+        if doc:
+            self.stats["mongo_hits"] += 1
+            self._remember(key, doc["feedback"])
+            return doc["feedback"]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, feedback: dict):
+        self._remember(key, feedback)
+        try:
+            await self.collection.update_one(
+                {"key": key},
+                {"$setOnInsert": {
+                    "key": key,
+                    "feedback": feedback,
+                    "created_at": datetime.now(timezone.utc).isoformat()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            # Losing the persistent copy only costs a future regeneration.
+            logger.warning(f"Failed to persist cached feedback: {e}")
+
+    async def get_or_generate(self, ai_service, question: str, user_answer: str, score: float) -> dict:
+        key = feedback_cache_key(question, user_answer, score, ai_service.feedback_version)
+        feedback = await self.get(key)
+        if feedback is not None:
+            return feedback
+
+        feedback = await ai_service.generate_feedback(
+            question=question,
+            user_answer=user_answer,
+            score=score
+        )
+        if not feedback.get("fallback"):
+            await self.set(key, feedback)
+        return feedback
+
+    async def stream(self, ai_service, question: str, user_answer: str, score: float):
+        # Streaming form of get_or_generate: a cache hit is a single "feedback"
+        # event, a miss streams from the model and stores the final result.
+        key = feedback_cache_key(question, user_answer, score, ai_service.feedback_version)
+        feedback = await self.get(key)
+        if feedback is not None:
+            yield "feedback", feedback
+            return
+
+        async for event, data in ai_service.stream_feedback(question, user_answer, score):
+            if event == "feedback" and not data.get("fallback"):
+                await self.set(key, data)
+            yield event, data
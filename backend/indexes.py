@@ -0,0 +1,121 @@
+import sys
+import asyncio
+import logging
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Indexes for every query shape in server.py. Collections owned by other
+# modules (feedback_cache, question_pool, completion_jobs, interview_answers,
+# user_analytics, insight_buckets) declare their own.
+INDEXES = {
+    "users": [
+        {"keys": [("email", ASCENDING)], "name": "users_email", "unique": True},
+        {"keys": [("id", ASCENDING)], "name": "users_id", "unique": True},
+        {"keys": [("role", ASCENDING), ("average_score", DESCENDING), ("id", DESCENDING)],
+         "name": "users_role_average_score_id"},
+    ],
+    "interviews": [
+        {"keys": [("id", ASCENDING)], "name": "interviews_id", "unique": True},
+        {"keys": [("user_id", ASCENDING), ("started_at", DESCENDING), ("id", DESCENDING)],
+         "name": "interviews_user_started_id"},
+        {"keys": [("user_id", ASCENDING), ("status", ASCENDING), ("completed_at", ASCENDING)],
+         "name": "interviews_user_status_completed"},
+        {"keys": [("status", ASCENDING), ("completed_at", DESCENDING)], "name": "interviews_status_completed"},
+    ],
+    "evaluations": [
+        {"keys": [("interview_id", ASCENDING), ("user_id", ASCENDING)], "name": "evaluations_interview_user",
+         "unique": True},
+    ],
+}
+
+# (collection, filter, sort) for each query the API issues; values are
+# placeholders, only the shape matters to the planner.
+QUERY_SHAPES = [
+    ("users", {"email": "x"}, None),
+    ("users", {"id": "x"}, None),
+    ("users", {"role": "user"}, [("average_score", DESCENDING), ("id", DESCENDING)]),
+    ("interviews", {"id": "x", "user_id": "x"}, None),
+    ("interviews", {"id": "x"}, None),
+    ("interviews", {"id": {"$in": ["x"]}}, None),
+    ("interviews", {"user_id": "x"}, [("started_at", DESCENDING), ("id", DESCENDING)]),
+    ("interviews", {"user_id": "x", "status": "completed"}, [("completed_at", ASCENDING)]),
+    ("interviews", {"status": "completed"}, None),
+    ("evaluations", {"interview_id": "x", "user_id": "x"}, None),
+    ("evaluations", {"interview_id": "x"}, None),
+    ("interview_answers", {"interview_id": "x"}, [("number", ASCENDING)]),
+    ("interview_answers", {"interview_id": "x", "number": 1}, None),
+    ("interview_answers", {"interview_id": {"$in": ["x"]}}, None),
+    ("user_analytics", {"user_id": "x"}, None),
+    ("insight_buckets", {"day": {"$gte": "2024-01-01", "$lte": "2024-01-31"}}, None),
+    ("feedback_cache", {"key": "x"}, None),
+    ("question_pool", {"interview_type": "HR", "focus_area": "", "question_number": 1,
+                       "fingerprint": {"$nin": ["x"]}}, [("created_at", ASCENDING)]),
+    ("user_seen_questions", {"user_id": "x"}, None),
+    ("completion_jobs", {"id": "x", "user_id": "x"}, None),
+    ("completion_jobs", {"interview_id": "x"}, None),
+    ("completion_jobs", {"status": {"$in": ["queued", "running"]}}, None),
+]
+
+
+async def ensure_indexes(db):
+    # create_index is a no-op when an identical index exists, so this runs on
+    # every startup. A failure (e.g. duplicate emails blocking a unique index)
+    # is logged rather than preventing the API from starting.
+    for collection, indexes in INDEXES.items():
+        for spec in indexes:
+            options = {k: v for k, v in spec.items() if k != "keys"}
+            try:
+                await db[collection].create_index(spec["keys"], **options)
+            except OperationFailure as e:
+                logger.error(f"Could not create index {spec['name']} on {collection}: {e}")
+
+
+def plan_stages(plan: dict):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from plan_stages(child)
+
+
+async def explain_query_shapes(db) -> list:
+    problems = []
+    for collection, query, sort in QUERY_SHAPES:
+        command = {"find": collection, "filter": query}
+        if sort:
+            command["sort"] = dict(sort)
+        result = await db.command({"explain": command, "verbosity": "queryPlanner"})
+        stages = set(plan_stages(result["queryPlanner"]["winningPlan"]))
+        status = "COLLSCAN" if "COLLSCAN" in stages else ("SORT" if "SORT" in stages else "ok")
+        print(f"{status:9} {collection:20} filter={query} sort={sort}")
+        if status == "COLLSCAN":
+            problems.append((collection, query, sort))
+    return problems
+
+
+async def main(argv):
+    from server import db, feedback_cache, question_pool, completion_queue, answer_store, user_rollups, insight_buckets
+
+    await ensure_indexes(db)
+    await feedback_cache.ensure_indexes()
+    await question_pool.ensure_indexes()
+    await completion_queue.ensure_indexes()
+    await answer_store.ensure_indexes()
+    await user_rollups.ensure_indexes()
+    await insight_buckets.ensure_indexes()
+    print("Indexes ensured")
+
+    if "--explain" in argv:
+        problems = await explain_query_shapes(db)
+        if problems:
+            print(f"{len(problems)} query shape(s) use a collection scan")
+            return 1
+        print("All query shapes are index-backed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
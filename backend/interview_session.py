@@ -0,0 +1,97 @@
+import logging
+from typing import List, Optional
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class SessionConflict(Exception):
+    # Another session or a REST call answered the same question first.
+    pass
+
+
+class InterviewSession:
+    # The state of one interview for the lifetime of a WebSocket: the header,
+    # questions and answers are read once on connect and kept in memory.
+    # Changes are queued write-behind and flushed as one batch (an ordered
+    # insert of the new answers, then a single header update) whenever the
+    # caller needs them durable: before acknowledging an answer and on close.
+
+    def __init__(self, db, answer_store, interview: dict, answers: List[dict]):
+        self.db = db
+        self.answer_store = answer_store
+        self.interview = interview
+        self.answers = answers
+        self._pending_answers = []
+        self._pending_questions = []
+
+    @classmethod
+    async def load(cls, db, answer_store, interview_id: str, user_id: str) -> Optional["InterviewSession"]:
+        interview = await db.interviews.find_one({"id": interview_id, "user_id": user_id}, {"_id": 0})
+        if not interview:
+            return None
+        return cls(db, answer_store, interview, await answer_store.list(interview_id))
+
+    @property
+    def answer_count(self) -> int:
+        return len(self.answers)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending_answers or self._pending_questions)
+
+    def question(self, question_id: str) -> Optional[dict]:
+        return next((q for q in self.interview["questions"] if q["id"] == question_id), None)
+
+    def current_question(self) -> Optional[dict]:
+        return next((q for q in self.interview["questions"] if q["number"] == self.answer_count + 1), None)
+
+    def previous_answer(self, number: int) -> Optional[dict]:
+        return self.answers[number - 2] if number > 1 else None
+
+    def record_answer(self, number: int, answer: dict):
+        self.answers.append({
+            "interview_id": self.interview["id"],
+            "user_id": self.interview["user_id"],
+            "number": number,
+            **answer
+        })
+        self.interview["answer_count"] = number
+        self._pending_answers.append((number, answer))
+
+    def add_question(self, question: dict):
+        self.interview["questions"].append(question)
+        self._pending_questions.append(question)
+
+    async def flush(self):
+        if not self.pending:
+            return
+        if self._pending_answers:
+            try:
+                await self.answer_store.insert_many(
+                    self.interview["id"], self.interview["user_id"], self._pending_answers
+                )
+            except BulkWriteError as e:
+                if any(error.get("code") == 11000 for error in e.details.get("writeErrors", [])):
+                    raise SessionConflict()
+                raise
+            self._pending_answers = []
+        # Same header update submit_answer makes, for every question queued.
+        update = {"$max": {"answer_count": self.interview["answer_count"]}}
+        if self._pending_questions:
+            update["$push"] = {"questions": {"$each": self._pending_questions}}
+        await self.db.interviews.update_one({"id": self.interview["id"]}, update)
+        self._pending_questions = []
+
+    async def reload(self):
+        # Drops unflushed changes and rereads the stored state, e.g. after a conflict.
+        self._pending_answers, self._pending_questions = [], []
+        fresh = await self.load(self.db, self.answer_store, self.interview["id"], self.interview["user_id"])
+        self.interview, self.answers = fresh.interview, fresh.answers
+
+    def snapshot(self) -> dict:
+        return {
+            "interview": {k: v for k, v in self.interview.items() if k != "stats_applied"},
+            "answers": self.answers,
+            "current_question": self.current_question()
+        }
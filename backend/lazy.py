@@ -0,0 +1,76 @@
+from typing import Any, Callable
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+class LazyObject:
+    # Stands in for factory() and builds it on first attribute access, so
+    # module-level services cost nothing until a request needs them.
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+
+    @property
+    def created(self) -> bool:
+        return self._instance is not None
+
+    def resolve(self) -> Any:
+        if self._instance is None:
+            object.__setattr__(self, "_instance", self._factory())
+        return self._instance
+
+    def __getattr__(self, name: str):
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value):
+        setattr(self.resolve(), name, value)
+
+
+class LazyCollection:
+    # A collection handle that can be stored at import time; the client is
+    # created when the first operation is issued through it.
+
+    def __init__(self, database: "LazyDatabase", name: str):
+        self.database = database
+        self.name = name
+
+    def __getattr__(self, name: str):
+        return getattr(self.database.resolve()[self.name], name)
+
+
+class LazyDatabase:
+    # client[name] where the client comes from connect() on first use.
+    # db.users and db["users"] return LazyCollections; database methods
+    # (command, drop_collection, ...) resolve the real database.
+
+    def __init__(self, connect: Callable[[], Any], name: str):
+        self._connect = connect
+        self._name = name
+        self._client = None
+
+    @property
+    def created(self) -> bool:
+        return self._client is not None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._connect()
+        return self._client
+
+    def resolve(self):
+        return self.client[self._name]
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+
+    def __getitem__(self, name: str) -> LazyCollection:
+        return LazyCollection(self, name)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if hasattr(AsyncIOMotorDatabase, name):
+            return getattr(self.resolve(), name)
+        return LazyCollection(self, name)
@@ -0,0 +1,180 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from question_bank import QUESTION_BANK
+from tokenizer import tokenize, normalize_question
+
+SENTENCE_RE = re.compile(r"[.!?]+(?:\s|$)")
+
+
+def _phrase_pattern(phrases: Sequence[str]):
+    # Word boundaries only where the phrase starts/ends with a word character, so "%" still matches.
+    parts = [(r"\b" if p[0].isalnum() else "") + re.escape(p) + (r"\b" if p[-1].isalnum() else "") for p in phrases]
+    return re.compile("|".join(parts))
+
+
+FILLER_WORDS = ("um", "uh", "erm", "like", "basically", "actually", "literally", "you know", "kind of", "sort of")
+HEDGE_WORDS = ("maybe", "perhaps", "i think", "i guess", "i suppose", "probably", "not sure", "i don't know")
+ASSERTIVE_WORDS = ("i led", "i built", "i designed", "i delivered", "i decided", "i achieved", "i improved",
+                   "i managed", "i created", "i implemented", "i resolved", "successfully")
+
+# Signals for each STAR component; an answer is well structured when it touches all four.
+STAR_SIGNALS = (
+    ("situation", "context", "background", "when i was", "at my", "in my previous", "in my last", "in my current",
+     "role", "project", "team"),
+    ("task", "goal", "responsible", "needed to", "had to", "objective", "challenge", "problem"),
+    # Action is first-person action verbs, not a bare "i", which almost every answer contains.
+    ("action", "approach", "implemented", "decided", "worked", "built", "organized", "created", "i took")
+    + tuple(w for w in ASSERTIVE_WORDS if w.startswith("i ")),
+    ("result", "outcome", "as a result", "improved", "increased", "reduced", "achieved", "learned", "%"),
+)
+CONNECTIVES = ("first", "second", "then", "next", "finally", "because", "therefore", "however",
+               "as a result", "for example", "for instance", "in addition")
+
+FILLER_PATTERN = _phrase_pattern(FILLER_WORDS)
+HEDGE_PATTERN = _phrase_pattern(HEDGE_WORDS)
+ASSERTIVE_PATTERN = _phrase_pattern(ASSERTIVE_WORDS)
+CONNECTIVE_PATTERN = _phrase_pattern(CONNECTIVES)
+STAR_PATTERNS = [_phrase_pattern(signals) for signals in STAR_SIGNALS]
+
+DIMENSION_WEIGHTS = {"relevance": 0.35, "structure": 0.25, "clarity": 0.2, "confidence": 0.2}
+WEAKNESS_LABELS = {
+    "clarity": "Unclear communication",
+    "confidence": "Low confidence",
+    "structure": "Lack of structure",
+    "relevance": "Off-topic answer",
+}
+
+
+def _count_phrases(texts: Sequence[str], pattern) -> np.ndarray:
+    return np.array([len(pattern.findall(t)) for t in texts], dtype=np.float64)
+
+
+def _scale(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    return np.clip((values - low) / (high - low), 0.0, 1.0)
+
+
+class LocalScorer:
+    # Scores answers without a network call: TF-IDF similarity and key-point
+    # coverage against QUESTION_BANK references, STAR structure detection and
+    # length/filler heuristics, computed for a whole batch with NumPy.
+
+    def __init__(self, question_bank: Optional[dict] = None):
+        bank = QUESTION_BANK if question_bank is None else question_bank
+        self.references = {}
+        documents = []
+        for questions in bank.values():
+            for q in questions:
+                reference = " ".join([q["question"], q.get("ideal_answer", "")] + q.get("key_points", []))
+                self.references[normalize_question(q["question"])] = (reference, q.get("key_points", []))
+                documents.append(tokenize(reference))
+
+        self.vocabulary = {}
+        for tokens in documents:
+            for token in tokens:
+                self.vocabulary.setdefault(token, len(self.vocabulary))
+
+        doc_freq = np.zeros(len(self.vocabulary))
+        for tokens in documents:
+            doc_freq[[self.vocabulary[t] for t in set(tokens)]] += 1
+        self.idf = np.log((1 + len(documents)) / (1 + doc_freq)) + 1.0
+
+    def _tfidf(self, token_lists: List[List[str]], vocabulary: Dict[str, int], idf: np.ndarray) -> np.ndarray:
+        matrix = np.zeros((len(token_lists), len(vocabulary)))
+        for row, tokens in enumerate(token_lists):
+            if tokens:
+                np.add.at(matrix[row], [vocabulary[t] for t in tokens], 1.0)
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+    def _batch_vocabulary(self, token_lists: List[List[str]]) -> Tuple[Dict[str, int], np.ndarray]:
+        # Terms unseen in the bank (e.g. from model-generated questions) get the
+        # rarest-term weight so they still count towards similarity.
+        vocabulary = dict(self.vocabulary)
+        for tokens in token_lists:
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        idf = np.full(len(vocabulary), self.idf.max() if len(self.idf) else 1.0)
+        idf[:len(self.idf)] = self.idf
+        return vocabulary, idf
+
+    def _reference(self, question: str) -> Tuple[str, List[str]]:
+        # Questions generated by the model are not in the bank; compare against
+        # the question text itself so relevance still means "on topic".
+        return self.references.get(normalize_question(question), (question, []))
+
+    def score_batch(self, items: Sequence[Tuple[str, str]]) -> List[Dict]:
+        if not items:
+            return []
+
+        questions = [q for q, _ in items]
+        answers = [a.lower() for _, a in items]
+        references = [self._reference(q) for q in questions]
+        answer_tokens = [tokenize(a) for a in answers]
+
+        # Relevance: cosine similarity of TF-IDF vectors plus key-point coverage.
+        reference_tokens = [tokenize(r) for r, _ in references]
+        vocabulary, idf = self._batch_vocabulary(answer_tokens + reference_tokens)
+        similarity = np.einsum(
+            "ij,ij->i",
+            self._tfidf(answer_tokens, vocabulary, idf),
+            self._tfidf(reference_tokens, vocabulary, idf)
+        )
+        coverage = np.array([
+            np.mean([bool(set(tokenize(point)) & set(tokens)) for point in key_points]) if key_points else similarity[i]
+            for i, ((_, key_points), tokens) in enumerate(zip(references, answer_tokens))
+        ])
+        relevance = 0.5 * _scale(similarity, 0.05, 0.45) + 0.5 * coverage
+
+        word_counts = np.array([len(a.split()) for a in answers], dtype=np.float64)
+        sentence_counts = np.maximum(1, np.array([len(SENTENCE_RE.findall(a)) or 1 for a in answers], dtype=np.float64))
+        avg_sentence = word_counts / sentence_counts
+        safe_words = np.maximum(word_counts, 1.0)
+
+        # Structure: share of STAR components present, connectives, multi-sentence answers.
+        star = np.stack([_count_phrases(answers, pattern) > 0 for pattern in STAR_PATTERNS], axis=1).mean(axis=1)
+        connectives = _scale(_count_phrases(answers, CONNECTIVE_PATTERN), 0, 3)
+        structure = 0.6 * star + 0.25 * connectives + 0.15 * _scale(sentence_counts, 1, 4)
+
+        # Clarity: length in a reasonable range, readable sentences, few fillers.
+        filler_rate = _count_phrases(answers, FILLER_PATTERN) / safe_words
+        length_fit = np.minimum(_scale(word_counts, 10, 60), 1.0 - _scale(word_counts, 300, 600))
+        sentence_fit = 1.0 - _scale(np.abs(avg_sentence - 18), 6, 25)
+        clarity = 0.4 * length_fit + 0.35 * sentence_fit + 0.25 * (1.0 - _scale(filler_rate, 0.0, 0.08))
+
+        # Confidence: assertive first-person statements versus hedging and fillers.
+        hedge_rate = _count_phrases(answers, HEDGE_PATTERN) / safe_words
+        assertive = _scale(_count_phrases(answers, ASSERTIVE_PATTERN), 0, 2)
+        confidence = (0.45 * (1.0 - _scale(hedge_rate, 0.0, 0.05)) + 0.3 * assertive
+                      + 0.25 * (1.0 - _scale(filler_rate, 0.0, 0.08)))
+
+        dimensions = {
+            "clarity": clarity,
+            "confidence": confidence,
+            "structure": structure,
+            "relevance": relevance,
+        }
+        # Empty or near-empty answers cannot score well on any dimension.
+        length_factor = _scale(word_counts, 0, 10)
+        dimensions = {k: np.round(10.0 * v * length_factor, 1) for k, v in dimensions.items()}
+        score = np.round(sum(DIMENSION_WEIGHTS[k] * v for k, v in dimensions.items()), 1)
+
+        names = list(dimensions)
+        stacked = np.stack([dimensions[k] for k in names], axis=1)
+        weakest = stacked.argmin(axis=1)
+
+        results = []
+        for i in range(len(items)):
+            weakness = names[weakest[i]]
+            results.append({
+                "score": float(score[i]),
+                **{k: float(dimensions[k][i]) for k in names},
+                "weakness_identified": WEAKNESS_LABELS[weakness] if stacked[i, weakest[i]] < 7.0 else "",
+                "feedback": "",
+                "source": "local"
+            })
+        return results
+
+    def score(self, question: str, answer: str) -> Dict:
+        return self.score_batch([(question, answer)])[0]
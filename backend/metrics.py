@@ -0,0 +1,257 @@
+import os
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Sequence, Tuple
+from pymongo import monitoring
+
+SERVER_TIMING = os.environ.get("SERVER_TIMING", "false").lower() == "true"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (128, 512, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Per-request list of (component, seconds) feeding the Server-Timing header.
+# Motor copies the context into its executor threads, so Mongo command
+# events land in the list of the request that issued them.
+_timings: ContextVar[Optional[list]] = ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self):
+        return [f"{self.name}{_format_labels(self.labels, key)} {value}" for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts plus +Inf, then sum.
+            state = self._values.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+
+    def _samples(self):
+        lines = []
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+REGISTRY = []
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served.")
+HTTP_REQUEST_SIZE = Histogram("http_request_size_bytes", "HTTP request body size.", ("route",), SIZE_BUCKETS)
+HTTP_RESPONSE_SIZE = Histogram("http_response_size_bytes", "HTTP response body size.", ("route",), SIZE_BUCKETS)
+
+MONGO_LATENCY = Histogram("mongo_command_duration_seconds", "MongoDB command latency.", ("command", "collection"))
+MONGO_IN_FLIGHT = Gauge("mongo_commands_in_flight", "MongoDB commands awaiting a reply.")
+MONGO_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands.", ("command", "collection"))
+
+AI_LATENCY = Histogram("ai_call_duration_seconds", "Model provider call latency.", ("operation", "outcome"))
+AI_IN_FLIGHT = Gauge("ai_calls_in_flight", "Model provider calls in progress.")
+AI_METHOD_LATENCY = Histogram("ai_method_duration_seconds", "AIService method latency, fallbacks included.", ("method",))
+AI_PAYLOAD_SIZE = Histogram("ai_payload_size_bytes", "Prompt and completion sizes.", ("direction",), SIZE_BUCKETS)
+AI_TOKENS = Counter("ai_tokens_total", "LLM tokens by kind; source is provider or estimated.", ("kind", "source"))
+
+BCRYPT_LATENCY = Histogram("bcrypt_duration_seconds", "Password hashing and verification latency.", ("operation",))
+
+
+def render() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+def record_timing(component: str, seconds: float):
+    timings = _timings.get()
+    if timings is not None:
+        # list.append is atomic, so executor threads can record safely.
+        timings.append((component, seconds))
+
+
+@contextmanager
+def timed(histogram: Histogram, component: str, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, **labels)
+        record_timing(component, elapsed)
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    # Registered on the Motor client; sees every command the driver sends.
+
+    def __init__(self):
+        self._pending: Dict[Tuple, Tuple[str, str]] = {}
+
+    def _key(self, event) -> Tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        collection = event.command.get(event.command_name)
+        self._pending[self._key(event)] = (event.command_name, collection if isinstance(collection, str) else "")
+        MONGO_IN_FLIGHT.inc()
+
+    def _finish(self, event) -> Tuple[str, str]:
+        MONGO_IN_FLIGHT.dec()
+        return self._pending.pop(self._key(event), (event.command_name, ""))
+
+    def succeeded(self, event):
+        command, collection = self._finish(event)
+        seconds = event.duration_micros / 1e6
+        MONGO_LATENCY.observe(seconds, command=command, collection=collection)
+        record_timing("db", seconds)
+
+    def failed(self, event):
+        command, collection = self._finish(event)
+        seconds = event.duration_micros / 1e6
+        MONGO_LATENCY.observe(seconds, command=command, collection=collection)
+        MONGO_FAILURES.inc(command=command, collection=collection)
+        record_timing("db", seconds)
+
+
+def ai_hook(event: str, fields: dict):
+    # Registered with AIService.add_hook.
+    if event == "call_started":
+        AI_IN_FLIGHT.inc()
+    elif event == "call_finished":
+        AI_IN_FLIGHT.dec()
+        AI_LATENCY.observe(fields["seconds"], operation=fields["operation"], outcome=fields["outcome"])
+        record_timing("ai", fields["seconds"])
+    elif event == "payload":
+        AI_PAYLOAD_SIZE.observe(fields["prompt_bytes"], direction="prompt")
+        AI_PAYLOAD_SIZE.observe(fields["completion_bytes"], direction="completion")
+    elif event == "usage":
+        AI_TOKENS.inc(fields["prompt_tokens"], kind="prompt", source=fields["source"])
+        AI_TOKENS.inc(fields["completion_tokens"], kind="completion", source=fields["source"])
+    elif event == "method":
+        AI_METHOD_LATENCY.observe(fields["seconds"], method=fields["method"])
+
+
+def server_timing_header(timings: list, total: float) -> str:
+    totals = {}
+    for component, seconds in timings:
+        totals[component] = totals.get(component, 0.0) + seconds
+    entries = [f"{component};dur={seconds * 1000:.1f}" for component, seconds in totals.items()]
+    entries.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware so streaming responses are measured without
+    # buffering. The route label is the matched path template, not the URL.
+
+    def __init__(self, app, server_timing: bool = SERVER_TIMING):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings = []
+        token = _timings.set(timings)
+        status_code = 500
+        request_bytes = 0
+        response_bytes = 0
+
+        async def counting_receive():
+            nonlocal request_bytes
+            message = await receive()
+            if message["type"] == "http.request":
+                request_bytes += len(message.get("body", b""))
+            return message
+
+        async def instrumented_send(message):
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    header = server_timing_header(timings, time.perf_counter() - started)
+                    message = {**message, "headers": list(message.get("headers", [])) + [
+                        (b"server-timing", header.encode("latin-1"))
+                    ]}
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, counting_receive, instrumented_send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _timings.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - started, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
+            HTTP_REQUEST_SIZE.observe(request_bytes, route=route)
+            HTTP_RESPONSE_SIZE.observe(response_bytes, route=route)
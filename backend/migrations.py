@@ -0,0 +1,55 @@
+import sys
+import asyncio
+import logging
+from datetime import datetime, timezone
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 500
+
+
+def parse_timestamp(value):
+    # ISO strings written by older releases; naive values are assumed UTC.
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def backfill_last_login_at(db, batch_size: int = MIGRATION_BATCH_SIZE) -> int:
+    # Copies the ISO last_login string into a native BSON date, which the admin
+    # dashboard range-counts on. Only users still missing last_login_at are
+    # touched, so the backfill can be re-run.
+    migrated = 0
+    operations = []
+    async for user in db.users.find(
+        {"last_login": {"$type": "string"}, "last_login_at": {"$exists": False}},
+        {"_id": 1, "last_login": 1}
+    ):
+        last_login_at = parse_timestamp(user["last_login"])
+        if last_login_at is None:
+            logger.warning(f"Skipping unparseable last_login {user['last_login']!r}")
+            continue
+        operations.append(UpdateOne({"_id": user["_id"]}, {"$set": {"last_login_at": last_login_at}}))
+        if len(operations) >= batch_size:
+            await db.users.bulk_write(operations, ordered=False)
+            migrated += len(operations)
+            operations = []
+    if operations:
+        await db.users.bulk_write(operations, ordered=False)
+        migrated += len(operations)
+    return migrated
+
+
+async def main(argv):
+    from server import db
+
+    migrated = await backfill_last_login_at(db)
+    print(f"Stored last_login_at for {migrated} users")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(sys.argv[1:])))
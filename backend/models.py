@@ -12,6 +12,17 @@ class InterviewType(str, Enum):
     TECHNICAL = "Technical"
     BEHAVIORAL = "Behavioral"
 
+class EvaluationMode(str, Enum):
+    LOCAL = "local"
+    HYBRID = "hybrid"
+    LLM = "llm"
+
+class InsightWindow(str, Enum):
+    LAST_7_DAYS = "7d"
+    LAST_30_DAYS = "30d"
+    LAST_90_DAYS = "90d"
+    ALL = "all"
+
 class ReadinessStatus(str, Enum):
     READY = "Ready"
     NEEDS_PRACTICE = "Needs Practice"
@@ -58,12 +69,22 @@ class Interview(BaseModel):
     overall_score: Optional[float] = None
     questions: List[Dict[str, Any]] = []
     answers: List[Dict[str, Any]] = []
+    answer_count: int = 0
 
 class AnswerSubmit(BaseModel):
     interview_id: str
     question_id: str
     answer_text: str
 
+class BatchEvaluationItem(BaseModel):
+    interview_id: str
+    question_id: str
+    answer_text: Optional[str] = None
+
+class BatchEvaluationRequest(BaseModel):
+    items: List[BatchEvaluationItem]
+    mode: Optional[EvaluationMode] = None
+
 class Evaluation(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
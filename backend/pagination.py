@@ -0,0 +1,89 @@
+import os
+import json
+import base64
+import binascii
+from typing import Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+
+PAGE_SIZE_DEFAULT = int(os.environ.get("PAGE_SIZE_DEFAULT", "100"))
+PAGE_SIZE_MAX = int(os.environ.get("PAGE_SIZE_MAX", "500"))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Only scalars: a value is used as-is in the keyset filter, so a crafted
+    # {"$ne": ...} must not turn into a query operator.
+    if not isinstance(values, list) or len(values) != size or not all(
+        value is None or isinstance(value, (str, int, float)) for value in values
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def page_size(limit: Optional[int]) -> int:
+    if limit is None:
+        return min(PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX)
+    if limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    return min(limit, PAGE_SIZE_MAX)
+
+
+def select_fields(fields: Optional[str], allowed: Iterable[str], always: Iterable[str] = ()) -> Tuple[dict, set]:
+    # Returns the Mongo projection for a comma-separated field list and the set
+    # of fields to strip again (sort keys fetched only to build the cursor).
+    allowed = list(allowed)
+    requested = [f.strip() for f in fields.split(",") if f.strip()] if fields else allowed
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    hidden = {f for f in always if f not in requested}
+    projection = {"_id": 0, **{f: 1 for f in requested}, **{f: 1 for f in hidden}}
+    return projection, hidden
+
+
+def keyset_filter(sort: List[Tuple[str, int]], values: list) -> dict:
+    # Documents strictly after `values` in `sort` order, e.g. for
+    # [("started_at", -1), ("id", -1)]: started_at < v0 or (started_at == v0 and id < v1).
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {f: values[j] for j, (f, _) in enumerate(sort[:i])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+async def paginate(
+    collection,
+    query: dict,
+    sort: List[Tuple[str, int]],
+    projection: dict,
+    hidden: Iterable[str] = (),
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    # Keyset pagination: the last document's sort values become the cursor, so
+    # every page is an index seek regardless of how deep the caller has paged.
+    size = page_size(limit)
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor, len(sort)))]}
+
+    documents = await collection.find(query, projection).sort(sort).limit(size + 1).to_list(size + 1)
+
+    next_cursor = None
+    if len(documents) > size:
+        documents = documents[:size]
+        next_cursor = encode_cursor([documents[-1].get(field) for field, _ in sort])
+
+    for document in documents:
+        for field in hidden:
+            document.pop(field, None)
+    return documents, next_cursor
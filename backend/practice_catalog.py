@@ -0,0 +1,123 @@
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from models import InterviewType
+from tokenizer import tokenize
+from question_bank import QUESTION_BANK
+from question_pool import normalize_focus_area
+
+logger = logging.getLogger(__name__)
+
+# "bank" (built-in QUESTION_BANK), a path to a JSON file shaped like
+# {"HR": [{"question": ...}, ...]}, or "mongo" for the practice_questions collection.
+PRACTICE_CATALOG_SOURCE = os.environ.get("PRACTICE_CATALOG_SOURCE", "bank")
+PRACTICE_CACHE_MAX_AGE = int(os.environ.get("PRACTICE_CACHE_MAX_AGE", "3600"))
+
+
+def practice_question_id(category: str, question: str) -> str:
+    # Derived from content, so the same question keeps its id across restarts
+    # and workers, and clients can track progress against it.
+    normalized = " ".join(question.lower().split())
+    return hashlib.sha256(f"{category}\n{normalized}".encode("utf-8")).hexdigest()[:16]
+
+
+def serialize(items: List[dict]) -> Tuple[bytes, str]:
+    body = json.dumps(items, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so a W/ prefix still matches.
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class PracticeCatalog:
+    # Practice questions compiled once: stable ids, per-category JSON bytes
+    # with their ETag, and inverted indexes from keywords and focus areas to
+    # question positions, so filtered lookups never scan the bank.
+
+    def __init__(self, bank: Dict[str, List[dict]]):
+        self.items: Dict[str, List[dict]] = {}
+        self.bodies: Dict[str, Tuple[bytes, str]] = {}
+        self.keywords: Dict[str, Dict[str, set]] = {}
+        self.focus_areas: Dict[str, Dict[str, set]] = {}
+
+        for category, questions in bank.items():
+            category = InterviewType(category).value
+            items = []
+            keywords, focus_areas = {}, {}
+            for q in questions:
+                item = {"id": practice_question_id(category, q["question"]), "category": category, **q}
+                position = len(items)
+                items.append(item)
+
+                text = " ".join([q["question"], q.get("ideal_answer", "")] + q.get("key_points", []))
+                for token in set(tokenize(text)):
+                    keywords.setdefault(token, set()).add(position)
+                tags = q.get("focus_areas") or ([q["focus_area"]] if q.get("focus_area") else [])
+                for tag in tags:
+                    focus_areas.setdefault(normalize_focus_area(tag), set()).add(position)
+
+            self.items[category] = items
+            self.bodies[category] = serialize(items)
+            self.keywords[category] = keywords
+            self.focus_areas[category] = focus_areas
+
+    @classmethod
+    def from_file(cls, path: str) -> "PracticeCatalog":
+        return cls(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    @classmethod
+    async def from_mongo(cls, collection) -> "PracticeCatalog":
+        bank = {}
+        async for doc in collection.find({}, {"_id": 0}).sort([("category", 1), ("order", 1)]):
+            category = doc.pop("category")
+            doc.pop("order", None)
+            bank.setdefault(category, []).append(doc)
+        return cls(bank)
+
+    def _matches(self, category: str, focus_area: Optional[str], keyword: Optional[str]) -> List[int]:
+        positions = None
+
+        def narrow(found: set):
+            nonlocal positions
+            positions = set(found) if positions is None else positions & found
+
+        if focus_area:
+            focus = normalize_focus_area(focus_area)
+            tagged = self.focus_areas[category].get(focus)
+            if tagged is not None:
+                narrow(tagged)
+            else:
+                # Untagged banks: treat the focus area as keywords.
+                for token in tokenize(focus) or [focus]:
+                    narrow(self.keywords[category].get(token, set()))
+        if keyword:
+            for token in tokenize(keyword) or [keyword.lower()]:
+                narrow(self.keywords[category].get(token, set()))
+        return sorted(positions)
+
+    def response(self, category: InterviewType, focus_area: Optional[str] = None, keyword: Optional[str] = None) -> Tuple[bytes, str]:
+        category = category.value
+        if category not in self.items:
+            return serialize([])
+        if not focus_area and not keyword:
+            return self.bodies[category]
+        return serialize([self.items[category][i] for i in self._matches(category, focus_area, keyword)])
+
+
+async def load_catalog(db, source: str = PRACTICE_CATALOG_SOURCE) -> PracticeCatalog:
+    if source == "bank":
+        return PracticeCatalog(QUESTION_BANK)
+    if source == "mongo":
+        catalog = await PracticeCatalog.from_mongo(db.practice_questions)
+    else:
+        catalog = PracticeCatalog.from_file(source)
+    logger.info(f"Loaded practice catalog from {source}: {sum(len(v) for v in catalog.items.values())} questions")
+    return catalog
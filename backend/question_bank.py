@@ -0,0 +1,136 @@
+from models import InterviewType
+
+QUESTION_BANK = {
+    InterviewType.HR: [
+        {
+            "question": "Tell me about yourself.",
+            "ideal_answer": "Start with your current role, highlight relevant experience, mention key achievements, and connect to the role you're applying for.",
+            "key_points": ["Current role", "Relevant experience", "Key achievements", "Career goals"],
+            "common_mistakes": ["Being too personal", "Rambling without structure", "Not tailoring to the job"]
+        },
+        {
+            "question": "What are your strengths and weaknesses?",
+            "ideal_answer": "Choose strengths relevant to the role with examples. For weaknesses, mention something you're actively working to improve.",
+            "key_points": ["Relevant strengths", "Real examples", "Honest weakness", "Improvement plan"],
+            "common_mistakes": ["Generic answers", "Fake weaknesses", "No examples"]
+        },
+        {
+            "question": "Why should we hire you?",
+            "ideal_answer": "Highlight your unique value proposition, relevant skills, and how you can solve their problems or contribute to their goals.",
+            "key_points": ["Unique value", "Relevant skills", "Company knowledge", "Problem solving"],
+            "common_mistakes": ["Being arrogant", "Generic response", "Not researching company"]
+        },
+        {
+            "question": "Describe a challenge you faced and how you handled it.",
+            "ideal_answer": "Use STAR method: Situation, Task, Action, Result. Focus on your specific actions and the positive outcome.",
+            "key_points": ["Clear situation", "Your role", "Specific actions", "Measurable results"],
+            "common_mistakes": ["Blaming others", "No clear resolution", "Vague details"]
+        },
+        {
+            "question": "How do you handle pressure and deadlines?",
+            "ideal_answer": "Describe your prioritization strategy, time management techniques, and give a specific example of handling pressure successfully.",
+            "key_points": ["Prioritization", "Time management", "Staying calm", "Real example"],
+            "common_mistakes": ["Saying you never feel pressure", "No concrete examples"]
+        },
+        {
+            "question": "Where do you see yourself in 5 years?",
+            "ideal_answer": "Show ambition aligned with the company's growth path. Mention skills you want to develop and value you want to add.",
+            "key_points": ["Career growth", "Skill development", "Company alignment", "Realistic goals"],
+            "common_mistakes": ["Too vague", "Different career path", "No growth mindset"]
+        },
+        {
+            "question": "What motivates you at work?",
+            "ideal_answer": "Connect your motivation to the role's responsibilities. Mention intrinsic factors like learning, impact, or teamwork.",
+            "key_points": ["Intrinsic motivation", "Role relevance", "Growth mindset", "Team contribution"],
+            "common_mistakes": ["Only money", "Too generic", "Not role-specific"]
+        }
+    ],
+    InterviewType.TECHNICAL: [
+        {
+            "question": "Explain a project you have worked on.",
+            "ideal_answer": "Describe the problem, your technical approach, technologies used, challenges faced, and the impact of your solution.",
+            "key_points": ["Problem statement", "Technical solution", "Your contribution", "Impact/results"],
+            "common_mistakes": ["Too technical without context", "No mention of impact", "Taking all credit"]
+        },
+        {
+            "question": "What is the difference between stack and queue?",
+            "ideal_answer": "Stack is LIFO (Last In First Out), queue is FIFO (First In First Out). Give real-world examples and use cases.",
+            "key_points": ["LIFO vs FIFO", "Operations", "Use cases", "Time complexity"],
+            "common_mistakes": ["No examples", "Confusing the concepts", "No practical use cases"]
+        },
+        {
+            "question": "What is an API and why is it used?",
+            "ideal_answer": "API is a set of protocols for building software. It allows different applications to communicate. Explain with REST or GraphQL examples.",
+            "key_points": ["Definition", "Purpose", "Types (REST, GraphQL)", "Real example"],
+            "common_mistakes": ["Too vague", "No examples", "Only theoretical"]
+        },
+        {
+            "question": "How do you debug an application?",
+            "ideal_answer": "Describe your systematic approach: reproduce the bug, check logs, use debugging tools, isolate the issue, fix and test.",
+            "key_points": ["Reproduce bug", "Check logs", "Use debugger", "Root cause analysis", "Testing"],
+            "common_mistakes": ["Random fixes", "No systematic approach", "Not testing fix"]
+        },
+        {
+            "question": "Explain one technology you are confident in.",
+            "ideal_answer": "Choose a relevant technology, explain its purpose, your experience level, projects where you used it, and why you like it.",
+            "key_points": ["Technology name", "Your experience", "Real projects", "Why you chose it"],
+            "common_mistakes": ["Too shallow", "No practical experience", "Outdated technology"]
+        },
+        {
+            "question": "What is the difference between frontend and backend?",
+            "ideal_answer": "Frontend is client-side (UI/UX, user interactions), backend is server-side (logic, database, APIs). Mention technologies for each.",
+            "key_points": ["Frontend definition", "Backend definition", "Technologies", "How they interact"],
+            "common_mistakes": ["Oversimplifying", "No mention of technologies", "Confusing terms"]
+        },
+        {
+            "question": "What is database normalization?",
+            "ideal_answer": "Process of organizing data to reduce redundancy. Explain 1NF, 2NF, 3NF with examples and benefits.",
+            "key_points": ["Definition", "Normal forms", "Benefits", "Trade-offs"],
+            "common_mistakes": ["Only definition", "No examples", "Not explaining why it matters"]
+        }
+    ],
+    InterviewType.BEHAVIORAL: [
+        {
+            "question": "Describe a time you worked in a team.",
+            "ideal_answer": "Use STAR method. Highlight your role, collaboration skills, how you handled conflicts, and the team's success.",
+            "key_points": ["Team context", "Your role", "Collaboration", "Outcome"],
+            "common_mistakes": ["Only 'I' statements", "No specific example", "Negative team comments"]
+        },
+        {
+            "question": "Tell me about a conflict you faced and how you resolved it.",
+            "ideal_answer": "Describe the conflict objectively, your approach to resolution, communication used, and the positive outcome.",
+            "key_points": ["Conflict context", "Your approach", "Communication", "Resolution"],
+            "common_mistakes": ["Blaming others", "Avoiding conflict", "No resolution shown"]
+        },
+        {
+            "question": "Describe a failure and what you learned from it.",
+            "ideal_answer": "Be honest about the failure, take ownership, explain what you learned, and how you applied that learning.",
+            "key_points": ["What happened", "Your ownership", "Lessons learned", "How you grew"],
+            "common_mistakes": ["Blaming externals", "Not showing growth", "Fake failure"]
+        },
+        {
+            "question": "How do you handle feedback?",
+            "ideal_answer": "Explain your openness to feedback, how you process it, examples of acting on feedback, and how it helped you improve.",
+            "key_points": ["Open mindset", "Processing feedback", "Taking action", "Growth example"],
+            "common_mistakes": ["Being defensive", "No examples", "Saying you never get negative feedback"]
+        },
+        {
+            "question": "Give an example of leadership.",
+            "ideal_answer": "Describe a situation where you led (formally or informally), your approach, how you motivated others, and the outcome.",
+            "key_points": ["Leadership context", "Your approach", "Team motivation", "Results"],
+            "common_mistakes": ["No specific example", "Authoritative style only", "Taking all credit"]
+        },
+        {
+            "question": "Describe a situation where you missed a deadline.",
+            "ideal_answer": "Be honest, explain circumstances, what you did to mitigate, what you learned, and how you prevent it now.",
+            "key_points": ["What happened", "Your actions", "Communication", "Learning"],
+            "common_mistakes": ["Blaming others", "Not showing learning", "No prevention strategy"]
+        },
+        {
+            "question": "How do you prioritize tasks?",
+            "ideal_answer": "Explain your prioritization framework (urgency/importance matrix), tools you use, and give a real example.",
+            "key_points": ["Framework/method", "Tools used", "Example", "Flexibility"],
+            "common_mistakes": ["No clear method", "Too rigid", "No examples"]
+        }
+    ]
+}
@@ -0,0 +1,239 @@
+import os
+import re
+import uuid
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from pymongo.errors import DuplicateKeyError
+from models import InterviewType
+from question_bank import QUESTION_BANK
+
+logger = logging.getLogger(__name__)
+
+POOL_LOW_WATERMARK = int(os.environ.get("QUESTION_POOL_LOW_WATERMARK", "3"))
+POOL_HIGH_WATERMARK = int(os.environ.get("QUESTION_POOL_HIGH_WATERMARK", "10"))
+POOL_QUESTIONS_PER_INTERVIEW = 5
+# Upper bound on remembered questions per user for the "already seen" filter.
+SEEN_QUESTIONS_LIMIT = int(os.environ.get("QUESTION_POOL_SEEN_LIMIT", "500"))
+# Seconds one instance holds the warm-up lease; other instances skip warming.
+POOL_WARM_LEASE = int(os.environ.get("QUESTION_POOL_WARM_LEASE", "600"))
+# Comma-separated focus areas that get a pool of their own. Any other focus
+# area draws from the general pool, so free-form input never creates pool
+# keys, and with them refills that each cost model calls.
+POOL_FOCUS_AREAS = os.environ.get("QUESTION_POOL_FOCUS_AREAS", "")
+
+
+def normalize_focus_area(focus_area: Optional[str]) -> str:
+    if not focus_area:
+        return ""
+    return re.sub(r"\s+", " ", focus_area).strip().lower()
+
+
+def question_fingerprint(question: str) -> str:
+    normalized = re.sub(r"[^a-z0-9 ]", "", re.sub(r"\s+", " ", question.lower())).strip()
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+class QuestionPool:
+    # Pre-generated questions per (interview type, focus area, question number),
+    # drawn without waiting on the model and refilled in the background.
+
+    def __init__(
+        self,
+        db,
+        ai_service,
+        low_watermark: int = POOL_LOW_WATERMARK,
+        high_watermark: int = POOL_HIGH_WATERMARK,
+        focus_areas: Optional[List[str]] = None
+    ):
+        self.collection = db.question_pool
+        self.seen = db.user_seen_questions
+        self.leases = db.question_pool_leases
+        self.ai_service = ai_service
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        if focus_areas is None:
+            focus_areas = POOL_FOCUS_AREAS.split(",")
+        self.focus_areas = {normalize_focus_area(area) for area in focus_areas} | {""}
+        self._refilling = {}
+        self.stats = {"pool_hits": 0, "static_fallbacks": 0, "refills": 0, "generated": 0, "released": 0}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index(
+            [("interview_type", 1), ("focus_area", 1), ("question_number", 1), ("fingerprint", 1)],
+            unique=True
+        )
+        await self.seen.create_index("user_id", unique=True)
+
+    def pool_focus_area(self, focus_area: Optional[str]) -> str:
+        focus = normalize_focus_area(focus_area)
+        return focus if focus in self.focus_areas else ""
+
+    def _pool_filter(self, interview_type: InterviewType, focus_area: str, question_number: int) -> dict:
+        return {
+            "interview_type": interview_type.value,
+            "focus_area": focus_area,
+            "question_number": question_number
+        }
+
+    async def seen_fingerprints(self, user_id: str) -> List[str]:
+        doc = await self.seen.find_one({"user_id": user_id}, {"_id": 0, "fingerprints": 1})
+        return doc.get("fingerprints", []) if doc else []
+
+    async def mark_seen(self, user_id: str, fingerprint: str):
+        await self.seen.update_one(
+            {"user_id": user_id},
+            {"$push": {"fingerprints": {"$each": [fingerprint], "$slice": -SEEN_QUESTIONS_LIMIT}}},
+            upsert=True
+        )
+
+    async def draw(
+        self,
+        interview_type: InterviewType,
+        focus_area: Optional[str],
+        question_number: int,
+        user_id: str
+    ) -> dict:
+        question = await self.reserve(interview_type, focus_area, question_number, user_id)
+        await self.accept(question, user_id)
+        return question
+
+    async def reserve(
+        self,
+        interview_type: InterviewType,
+        focus_area: Optional[str],
+        question_number: int,
+        user_id: str
+    ) -> dict:
+        # Takes a question out of the pool without marking it seen; the caller
+        # accept()s it once it is served or release()s it back if unused.
+        focus = self.pool_focus_area(focus_area)
+        seen = await self.seen_fingerprints(user_id)
+
+        doc = await self.collection.find_one_and_delete(
+            {**self._pool_filter(interview_type, focus, question_number), "fingerprint": {"$nin": seen}},
+            projection={"_id": 0},
+            sort=[("created_at", 1)]
+        )
+        self.schedule_refill(interview_type, focus, question_number)
+
+        if doc:
+            self.stats["pool_hits"] += 1
+            return {"question": doc["question"], "difficulty": doc.get("difficulty", "medium"), "pool_entry": doc}
+        self.stats["static_fallbacks"] += 1
+        return self.static_question(interview_type, question_number, seen)
+
+    async def accept(self, question: dict, user_id: str):
+        await self.mark_seen(user_id, question_fingerprint(question["question"]))
+
+    async def release(self, question: dict):
+        # Puts a reserved question back with its original created_at, so it
+        # keeps its place in the draw order. Static questions have no entry.
+        entry = question.get("pool_entry")
+        if not entry:
+            return
+        key = {k: entry[k] for k in ("interview_type", "focus_area", "question_number", "fingerprint")}
+        try:
+            await self.collection.update_one(
+                key,
+                {"$setOnInsert": {k: v for k, v in entry.items() if k not in key}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return
+        self.stats["released"] += 1
+
+    def static_question(self, interview_type: InterviewType, question_number: int, seen: List[str]) -> dict:
+        bank = QUESTION_BANK.get(interview_type, [])
+        if not bank:
+            return {"question": "Tell me about yourself.", "difficulty": "medium"}
+
+        # Rotate by question number so consecutive questions differ even when
+        # every bank question has already been seen.
+        offset = (question_number - 1) % len(bank)
+        ordered = bank[offset:] + bank[:offset]
+        seen = set(seen)
+        for q in ordered:
+            if question_fingerprint(q["question"]) not in seen:
+                return {"question": q["question"], "difficulty": "medium"}
+        return {"question": ordered[0]["question"], "difficulty": "medium"}
+
+    def schedule_refill(self, interview_type: InterviewType, focus_area: str, question_number: int):
+        key = (interview_type, focus_area, question_number)
+        if focus_area not in self.focus_areas or key in self._refilling:
+            return
+        task = asyncio.create_task(self.refill(interview_type, focus_area, question_number))
+        self._refilling[key] = task
+        task.add_done_callback(lambda _: self._refilling.pop(key, None))
+
+    async def warm(self) -> bool:
+        # Only the instance holding the lease warms the pool, so a deploy of
+        # many workers does not multiply the provider calls; the others rely
+        # on the refills their draws schedule.
+        if not await self._acquire_warm_lease():
+            return False
+        for interview_type in InterviewType:
+            for focus_area in sorted(self.focus_areas):
+                for number in range(1, POOL_QUESTIONS_PER_INTERVIEW + 1):
+                    self.schedule_refill(interview_type, focus_area, number)
+        return True
+
+    async def _acquire_warm_lease(self) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            # Matches only an expired lease; when it is still held the upsert
+            # collides with the existing _id.
+            await self.leases.update_one(
+                {"_id": "warm", "expires_at": {"$lt": now.isoformat()}},
+                {"$set": {"expires_at": (now + timedelta(seconds=POOL_WARM_LEASE)).isoformat()}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def refill(self, interview_type: InterviewType, focus_area: str, question_number: int):
+        pool_filter = self._pool_filter(interview_type, focus_area, question_number)
+        try:
+            available = await self.collection.count_documents(pool_filter)
+            if available >= self.low_watermark:
+                return
+            self.stats["refills"] += 1
+
+            # Duplicates from the model do not fill the pool, so bound attempts
+            # rather than looping until the high watermark is reached.
+            for _ in range(2 * (self.high_watermark - available)):
+                generated = await self.ai_service.generate_question(
+                    interview_type=interview_type,
+                    question_number=question_number,
+                    focus_area=focus_area or None
+                )
+                if generated.get("fallback"):
+                    # The model is unavailable; the static bank already covers this.
+                    break
+                if await self._insert(pool_filter, generated):
+                    available += 1
+                    self.stats["generated"] += 1
+                if available >= self.high_watermark:
+                    break
+        except Exception as e:
+            logger.warning(f"Question pool refill failed for {pool_filter}: {e!r}")
+
+    async def _insert(self, pool_filter: dict, generated: dict) -> bool:
+        fingerprint = question_fingerprint(generated["question"])
+        try:
+            result = await self.collection.update_one(
+                {**pool_filter, "fingerprint": fingerprint},
+                {"$setOnInsert": {
+                    "id": str(uuid.uuid4()),
+                    "question": generated["question"],
+                    "difficulty": generated.get("difficulty", "medium"),
+                    "created_at": datetime.now(timezone.utc).isoformat()
+                }},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False
+        return result.upserted_id is not None
@@ -0,0 +1,75 @@
+import time
+from collections import deque
+from typing import Optional
+import numpy as np
+
+
+class LatencyTracker:
+    # Rolling window of successful call latencies, used to pick the hedge delay.
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.samples) < self.min_samples:
+            return None
+        return float(np.percentile(np.fromiter(self.samples, dtype=np.float64), q))
+
+
+class CircuitBreaker:
+    # closed: calls flow; open: calls fail fast until the cooldown passes;
+    # half-open: a single trial call decides whether to close or re-open.
+
+    def __init__(self, failure_rate: float = 0.5, window: int = 20, min_calls: int = 10, cooldown: float = 30.0):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.outcomes = deque(maxlen=window)
+        self.state = "closed"
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self.stats = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.stats["rejected"] += 1
+                return False
+            self.state = "half_open"
+        if self.state == "half_open":
+            if self._trial_in_flight:
+                self.stats["rejected"] += 1
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def release(self):
+        # The call allow() admitted ended without an outcome (e.g. it was
+        # cancelled); in half-open state the next call becomes the trial.
+        if self.state == "half_open":
+            self._trial_in_flight = False
+
+    def record(self, success: bool):
+        if self.state == "half_open":
+            self._trial_in_flight = False
+            if success:
+                self.state = "closed"
+                self.outcomes.clear()
+            else:
+                self._open()
+            return
+
+        self.outcomes.append(success)
+        failures = self.outcomes.count(False)
+        if len(self.outcomes) >= self.min_calls and failures / len(self.outcomes) >= self.failure_rate:
+            self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+        self.stats["opened"] += 1
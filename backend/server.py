@@ -1,20 +1,39 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, WebSocket, WebSocketDisconnect, status
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 import os
+import asyncio
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, Callable, List, Optional
 import uuid
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone, timedelta
 from models import (
     User, UserCreate, UserLogin, TokenResponse, Role, InterviewType,
     InterviewStart, Interview, AnswerSubmit, Evaluation, PracticeQuestion,
-    ReadinessStatus
+    ReadinessStatus, BatchEvaluationRequest, InsightWindow
 )
-from auth import hash_password, verify_password, create_access_token, get_current_user, require_admin
-from ai_service import AIService
+from auth import (
+    hash_password, verify_password, password_needs_rehash, create_access_token, decode_token, get_current_user,
+    require_admin, token_cache
+)
+from user_cache import UserCache, USER_PRIVATE_PROJECTION
+import metrics
+from feedback_cache import FeedbackCache
+from practice_catalog import PracticeCatalog, PRACTICE_CACHE_MAX_AGE, etag_matches, load_catalog
+from question_pool import QuestionPool
+from streaming import sse_event, sse_response, merge_feedback_streams
+from completion_jobs import CompletionQueue
+from indexes import ensure_indexes
+from answer_store import AnswerStore
+from interview_session import InterviewSession, SessionConflict
+from analytics import APPLIED_INTERVIEWS_LIMIT, UserRollups, InsightBuckets, growth_data, top_weak_areas, averages
+from pagination import NEXT_CURSOR_HEADER, PAGE_SIZE_MAX, paginate, select_fields
+from lazy import LazyDatabase, LazyObject
+from bootstrap import ensure_default_admin
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -25,149 +44,91 @@ db_name = os.environ.get("Interview_143", "interviewiq")
 if not mongo_url:
     raise RuntimeError("MONGO_URL is not set in environment variables")
 
-client = AsyncIOMotorClient(mongo_url)
-db = client["Interview_143"]
+# Serverless mode, on by default on Vercel: the Mongo client, AIService and
+# practice catalog are created on first use, and startup skips index builds,
+# pool warming and the admin bootstrap (run `python bootstrap.py` on deploy).
+COLD_START_MODE = os.environ.get("COLD_START_MODE", "true" if os.environ.get("VERCEL") else "false").lower() == "true"
+
+def connect_mongo() -> AsyncIOMotorClient:
+    return AsyncIOMotorClient(mongo_url, event_listeners=[metrics.MongoCommandListener()])
+
+def create_ai_service():
+    # Imported here so numpy and httpx load only once a request needs the model.
+    from ai_service import AIService
+    service = AIService()
+    service.add_hook(metrics.ai_hook)
+    return service
+
+db = LazyDatabase(connect_mongo, "Interview_143")
+ai_service = LazyObject(create_ai_service)
+if not COLD_START_MODE:
+    db.resolve()
+    ai_service.resolve()
 
 
 app = FastAPI()
 api_router = APIRouter(prefix="/api")
 
-ai_service = AIService()
+feedback_cache = FeedbackCache(db.feedback_cache)
+question_pool = QuestionPool(db, ai_service)
+answer_store = AnswerStore(db)
+user_rollups = UserRollups(db)
+insight_buckets = InsightBuckets(db)
+user_cache = UserCache(db.users)
+# Loaded at startup, or by the first practice request in cold-start mode.
+practice_catalog: Optional[PracticeCatalog] = None
 
-QUESTION_BANK = {
-    InterviewType.HR: [
-        {
-            "question": "Tell me about yourself.",
-            "ideal_answer": "Start with your current role, highlight relevant experience, mention key achievements, and connect to the role you're applying for.",
-            "key_points": ["Current role", "Relevant experience", "Key achievements", "Career goals"],
-            "common_mistakes": ["Being too personal", "Rambling without structure", "Not tailoring to the job"]
-        },
-        {
-            "question": "What are your strengths and weaknesses?",
-            "ideal_answer": "Choose strengths relevant to the role with examples. For weaknesses, mention something you're actively working to improve.",
-            "key_points": ["Relevant strengths", "Real examples", "Honest weakness", "Improvement plan"],
-            "common_mistakes": ["Generic answers", "Fake weaknesses", "No examples"]
-        },
-        {
-            "question": "Why should we hire you?",
-            "ideal_answer": "Highlight your unique value proposition, relevant skills, and how you can solve their problems or contribute to their goals.",
-            "key_points": ["Unique value", "Relevant skills", "Company knowledge", "Problem solving"],
-            "common_mistakes": ["Being arrogant", "Generic response", "Not researching company"]
-        },
-        {
-            "question": "Describe a challenge you faced and how you handled it.",
-            "ideal_answer": "Use STAR method: Situation, Task, Action, Result. Focus on your specific actions and the positive outcome.",
-            "key_points": ["Clear situation", "Your role", "Specific actions", "Measurable results"],
-            "common_mistakes": ["Blaming others", "No clear resolution", "Vague details"]
-        },
-        {
-            "question": "How do you handle pressure and deadlines?",
-            "ideal_answer": "Describe your prioritization strategy, time management techniques, and give a specific example of handling pressure successfully.",
-            "key_points": ["Prioritization", "Time management", "Staying calm", "Real example"],
-            "common_mistakes": ["Saying you never feel pressure", "No concrete examples"]
-        },
-        {
-            "question": "Where do you see yourself in 5 years?",
-            "ideal_answer": "Show ambition aligned with the company's growth path. Mention skills you want to develop and value you want to add.",
-            "key_points": ["Career growth", "Skill development", "Company alignment", "Realistic goals"],
-            "common_mistakes": ["Too vague", "Different career path", "No growth mindset"]
-        },
-        {
-            "question": "What motivates you at work?",
-            "ideal_answer": "Connect your motivation to the role's responsibilities. Mention intrinsic factors like learning, impact, or teamwork.",
-            "key_points": ["Intrinsic motivation", "Role relevance", "Growth mindset", "Team contribution"],
-            "common_mistakes": ["Only money", "Too generic", "Not role-specific"]
-        }
-    ],
-    InterviewType.TECHNICAL: [
-        {
-            "question": "Explain a project you have worked on.",
-            "ideal_answer": "Describe the problem, your technical approach, technologies used, challenges faced, and the impact of your solution.",
-            "key_points": ["Problem statement", "Technical solution", "Your contribution", "Impact/results"],
-            "common_mistakes": ["Too technical without context", "No mention of impact", "Taking all credit"]
-        },
-        {
-            "question": "What is the difference between stack and queue?",
-            "ideal_answer": "Stack is LIFO (Last In First Out), queue is FIFO (First In First Out). Give real-world examples and use cases.",
-            "key_points": ["LIFO vs FIFO", "Operations", "Use cases", "Time complexity"],
-            "common_mistakes": ["No examples", "Confusing the concepts", "No practical use cases"]
-        },
-        {
-            "question": "What is an API and why is it used?",
-            "ideal_answer": "API is a set of protocols for building software. It allows different applications to communicate. Explain with REST or GraphQL examples.",
-            "key_points": ["Definition", "Purpose", "Types (REST, GraphQL)", "Real example"],
-            "common_mistakes": ["Too vague", "No examples", "Only theoretical"]
-        },
-        {
-            "question": "How do you debug an application?",
-            "ideal_answer": "Describe your systematic approach: reproduce the bug, check logs, use debugging tools, isolate the issue, fix and test.",
-            "key_points": ["Reproduce bug", "Check logs", "Use debugger", "Root cause analysis", "Testing"],
-            "common_mistakes": ["Random fixes", "No systematic approach", "Not testing fix"]
-        },
-        {
-            "question": "Explain one technology you are confident in.",
-            "ideal_answer": "Choose a relevant technology, explain its purpose, your experience level, projects where you used it, and why you like it.",
-            "key_points": ["Technology name", "Your experience", "Real projects", "Why you chose it"],
-            "common_mistakes": ["Too shallow", "No practical experience", "Outdated technology"]
-        },
-        {
-            "question": "What is the difference between frontend and backend?",
-            "ideal_answer": "Frontend is client-side (UI/UX, user interactions), backend is server-side (logic, database, APIs). Mention technologies for each.",
-            "key_points": ["Frontend definition", "Backend definition", "Technologies", "How they interact"],
-            "common_mistakes": ["Oversimplifying", "No mention of technologies", "Confusing terms"]
-        },
-        {
-            "question": "What is database normalization?",
-            "ideal_answer": "Process of organizing data to reduce redundancy. Explain 1NF, 2NF, 3NF with examples and benefits.",
-            "key_points": ["Definition", "Normal forms", "Benefits", "Trade-offs"],
-            "common_mistakes": ["Only definition", "No examples", "Not explaining why it matters"]
-        }
-    ],
-    InterviewType.BEHAVIORAL: [
-        {
-            "question": "Describe a time you worked in a team.",
-            "ideal_answer": "Use STAR method. Highlight your role, collaboration skills, how you handled conflicts, and the team's success.",
-            "key_points": ["Team context", "Your role", "Collaboration", "Outcome"],
-            "common_mistakes": ["Only 'I' statements", "No specific example", "Negative team comments"]
-        },
-        {
-            "question": "Tell me about a conflict you faced and how you resolved it.",
-            "ideal_answer": "Describe the conflict objectively, your approach to resolution, communication used, and the positive outcome.",
-            "key_points": ["Conflict context", "Your approach", "Communication", "Resolution"],
-            "common_mistakes": ["Blaming others", "Avoiding conflict", "No resolution shown"]
-        },
-        {
-            "question": "Describe a failure and what you learned from it.",
-            "ideal_answer": "Be honest about the failure, take ownership, explain what you learned, and how you applied that learning.",
-            "key_points": ["What happened", "Your ownership", "Lessons learned", "How you grew"],
-            "common_mistakes": ["Blaming externals", "Not showing growth", "Fake failure"]
-        },
-        {
-            "question": "How do you handle feedback?",
-            "ideal_answer": "Explain your openness to feedback, how you process it, examples of acting on feedback, and how it helped you improve.",
-            "key_points": ["Open mindset", "Processing feedback", "Taking action", "Growth example"],
-            "common_mistakes": ["Being defensive", "No examples", "Saying you never get negative feedback"]
-        },
-        {
-            "question": "Give an example of leadership.",
-            "ideal_answer": "Describe a situation where you led (formally or informally), your approach, how you motivated others, and the outcome.",
-            "key_points": ["Leadership context", "Your approach", "Team motivation", "Results"],
-            "common_mistakes": ["No specific example", "Authoritative style only", "Taking all credit"]
-        },
-        {
-            "question": "Describe a situation where you missed a deadline.",
-            "ideal_answer": "Be honest, explain circumstances, what you did to mitigate, what you learned, and how you prevent it now.",
-            "key_points": ["What happened", "Your actions", "Communication", "Learning"],
-            "common_mistakes": ["Blaming others", "Not showing learning", "No prevention strategy"]
-        },
-        {
-            "question": "How do you prioritize tasks?",
-            "ideal_answer": "Explain your prioritization framework (urgency/importance matrix), tools you use, and give a real example.",
-            "key_points": ["Framework/method", "Tools used", "Example", "Flexibility"],
-            "common_mistakes": ["No clear method", "Too rigid", "No examples"]
-        }
-    ]
+BATCH_EVALUATION_MAX_ITEMS = int(os.environ.get("BATCH_EVALUATION_MAX_ITEMS", "500"))
+# Seconds after which an unfinished stats step of a completion may be retried.
+STATS_CLAIM_LEASE = int(os.environ.get("STATS_CLAIM_LEASE", "300"))
+
+# Fields list/summary endpoints read; questions and answers are detail-only.
+INTERVIEW_HEADER = {
+    "_id": 0, "id": 1, "user_id": 1, "interview_type": 1, "focus_area": 1, "status": 1,
+    "started_at": 1, "completed_at": 1, "overall_score": 1, "answer_count": 1
 }
+# User fields admins may list; the password hash is never projected.
+USER_PUBLIC_FIELDS = (
+    "id", "email", "name", "role", "created_at", "last_login",
+    "total_interviews", "average_score", "streak", "readiness_status"
+)
+
+def feedback_call(ans: dict):
+    return lambda: feedback_cache.get_or_generate(
+        ai_service,
+        question=ans["question"],
+        user_answer=ans["answer"],
+        score=ans["score"]
+    )
+
+def feedback_stream(ans: dict):
+    return feedback_cache.stream(
+        ai_service,
+        question=ans["question"],
+        user_answer=ans["answer"],
+        score=ans["score"]
+    )
+
+def fallback_feedback(ans: dict) -> dict:
+    from ai_service import default_feedback
+    return default_feedback(ans["question"], ans["answer"], ans["score"])
+
+def detailed_feedback_item(ans: dict, feedback: dict) -> dict:
+    return {
+        "question": ans["question"],
+        "your_answer": ans["answer"],
+        "score": ans["score"],
+        "improved_answer": feedback.get("improved_answer", ""),
+        "why_improved": feedback.get("why_improved", ""),
+        "mistakes": feedback.get("mistakes", [])
+    }
+
+async def get_current_user_doc(current_user: dict = Depends(get_current_user)) -> dict:
+    # The caller's user document (no password hash) from the per-worker cache.
+    user = await user_cache.get(current_user["sub"])
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
 
 @api_router.post("/auth/signup", response_model=TokenResponse)
 async def signup(user_data: UserCreate):
@@ -182,7 +143,7 @@ async def signup(user_data: UserCreate):
     user_dict = {
         "id": user_id,
         "email": user_data.email,
-        "password": hash_password(user_data.password),
+        "password": await hash_password(user_data.password),
         "name": user_data.name,
         "role": Role.USER.value,
         "created_at": datetime.now(timezone.utc).isoformat(),
@@ -193,7 +154,11 @@ async def signup(user_data: UserCreate):
         "readiness_status": ReadinessStatus.NOT_READY.value
     }
     
-    await db.users.insert_one(user_dict)
+    try:
+        await db.users.insert_one(user_dict)
+    except DuplicateKeyError:
+        # The unique email index settles concurrent signups for the same address.
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     token = create_access_token({"sub": user_id, "email": user_data.email, "role": Role.USER.value})
     user_dict.pop("password", None)
@@ -202,33 +167,37 @@ async def signup(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(login_data: UserLogin):
     user = await db.users.find_one({"email": login_data.email}, {"_id": 0})
-    if not user or not verify_password(login_data.password, user["password"]):
+    if not user or not await verify_password(login_data.password, user["password"]):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    await db.users.update_one(
-        {"email": login_data.email},
-        {"$set": {"last_login": datetime.now(timezone.utc).isoformat()}}
-    )
+    # last_login_at is the BSON date the admin dashboard range-counts on;
+    # last_login stays the ISO string the API has always returned.
+    now = datetime.now(timezone.utc)
+    update = {"last_login": now.isoformat(), "last_login_at": now}
+    if password_needs_rehash(user["password"]):
+        # The plaintext is only available here, so hashes made with an older
+        # BCRYPT_ROUNDS are upgraded as their owners log in.
+        update["password"] = await hash_password(login_data.password)
+    await db.users.update_one({"email": login_data.email}, {"$set": update})
+    user_cache.invalidate(user["id"])
     
     token = create_access_token({"sub": user["id"], "email": user["email"], "role": user["role"]})
     user.pop("password", None)
     return TokenResponse(access_token=token, user=User(**user))
 
 @api_router.get("/auth/me", response_model=User)
-async def get_me(current_user: dict = Depends(get_current_user)):
-    user = await db.users.find_one({"id": current_user["sub"]}, {"_id": 0, "password": 0})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+async def get_me(user: dict = Depends(get_current_user_doc)):
     return User(**user)
 
 @api_router.post("/interviews/start", response_model=Interview)
 async def start_interview(interview_data: InterviewStart, current_user: dict = Depends(get_current_user)):
     interview_id = str(uuid.uuid4())
     
-    first_question = await ai_service.generate_question(
+    first_question = await question_pool.draw(
         interview_type=interview_data.interview_type,
+        focus_area=interview_data.focus_area,
         question_number=1,
-        focus_area=interview_data.focus_area
+        user_id=current_user["sub"]
     )
     
     interview_dict = {
@@ -246,122 +215,235 @@ async def start_interview(interview_data: InterviewStart, current_user: dict = D
             "difficulty": first_question.get("difficulty", "medium"),
             "number": 1
         }],
-        "answers": []
+        "answer_count": 0
     }
     
     await db.interviews.insert_one(interview_dict)
     return Interview(**interview_dict)
 
+async def evaluate_submission(
+    interview: dict,
+    question: dict,
+    answer_text: str,
+    previous_answer: Optional[dict],
+    user_id: str,
+    on_evaluated: Optional[Callable[[dict, dict], Awaitable[None]]] = None
+):
+    # Shared by submit_answer and the WebSocket session: returns the evaluation,
+    # the answer document to store and the next question (None after the last).
+    # on_evaluated(evaluation, answer_obj) runs before the next question is awaited.
+    answer_count = question["number"]
+    interview_type = InterviewType(interview["interview_type"])
+    answer_obj = None
+    
+    async def evaluated(evaluation: dict):
+        nonlocal answer_obj
+        answer_obj = {
+            "question_id": question["id"],
+            "question": question["question"],
+            "answer": answer_text,
+            "score": evaluation["score"],
+            "evaluation": evaluation,
+            "submitted_at": datetime.now(timezone.utc).isoformat()
+        }
+        if on_evaluated is not None:
+            await on_evaluated(evaluation, answer_obj)
+    
+    evaluation, next_question = await ai_service.evaluate_and_generate_next(
+        question=question["question"],
+        answer=answer_text,
+        interview_type=interview_type,
+        previous_answers=[previous_answer] if previous_answer else [],
+        next_question_number=answer_count + 1 if answer_count < 5 else None,
+        focus_area=interview.get("focus_area"),
+        speculative_question=lambda: question_pool.reserve(
+            interview_type=interview_type,
+            focus_area=interview.get("focus_area"),
+            question_number=answer_count + 1,
+            user_id=user_id
+        ),
+        release_speculative=question_pool.release,
+        on_evaluation=evaluated
+    )
+    
+    if next_question:
+        await question_pool.accept(next_question, user_id)
+        next_question = {
+            "id": str(uuid.uuid4()),
+            "question": next_question["question"],
+            "difficulty": next_question.get("difficulty", "medium"),
+            "number": answer_count + 1
+        }
+    return evaluation, answer_obj, next_question
+
 @api_router.post("/interviews/answer")
 async def submit_answer(answer_data: AnswerSubmit, current_user: dict = Depends(get_current_user)):
+    # Only the answered question is read from the header; question n is served
+    # after n - 1 answers, and the unique (interview_id, number) key on
+    # interview_answers rejects concurrent or repeated answers to it.
     interview = await db.interviews.find_one(
         {"id": answer_data.interview_id, "user_id": current_user["sub"]},
-        {"_id": 0}
+        {
+            "_id": 0,
+            "interview_type": 1,
+            "focus_area": 1,
+            "answer_count": 1,
+            "questions": {"$elemMatch": {"id": answer_data.question_id}}
+        }
     )
     
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    question = next((q for q in interview["questions"] if q["id"] == answer_data.question_id), None)
+    question = (interview.get("questions") or [None])[0]
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
     
-    evaluation = await ai_service.evaluate_answer(
-        question=question["question"],
-        answer=answer_data.answer_text,
-        interview_type=InterviewType(interview["interview_type"])
-    )
+    answer_count = question["number"]
+    if interview.get("answer_count", 0) >= answer_count:
+        raise HTTPException(status_code=409, detail="Question already answered")
     
-    answer_obj = {
-        "question_id": answer_data.question_id,
-        "question": question["question"],
-        "answer": answer_data.answer_text,
-        "score": evaluation["score"],
-        "evaluation": evaluation,
-        "submitted_at": datetime.now(timezone.utc).isoformat()
-    }
+    previous_answer = await answer_store.get(answer_data.interview_id, answer_count - 1) if answer_count > 1 else None
+    evaluation, answer_obj, next_question = await evaluate_submission(
+        interview, question, answer_data.answer_text, previous_answer, current_user["sub"]
+    )
     
-    interview["answers"].append(answer_obj)
+    try:
+        await answer_store.insert(answer_data.interview_id, current_user["sub"], answer_count, answer_obj)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Question already answered")
     
-    next_question = None
-    if len(interview["answers"]) < 5:
-        next_question = await ai_service.generate_question(
-            interview_type=InterviewType(interview["interview_type"]),
-            question_number=len(interview["answers"]) + 1,
-            previous_answers=interview["answers"],
-            focus_area=interview.get("focus_area")
-        )
-        
-        interview["questions"].append({
-            "id": str(uuid.uuid4()),
-            "question": next_question["question"],
-            "difficulty": next_question.get("difficulty", "medium"),
-            "number": len(interview["answers"]) + 1
-        })
+    update = {"$max": {"answer_count": answer_count}}
+    if next_question:
+        update["$push"] = {"questions": next_question}
     
-    await db.interviews.update_one(
-        {"id": answer_data.interview_id},
-        {"$set": {"questions": interview["questions"], "answers": interview["answers"]}}
-    )
+    await db.interviews.update_one({"id": answer_data.interview_id}, update)
     
     return {
         "success": True,
         "evaluation": evaluation,
         "next_question": next_question,
-        "is_complete": len(interview["answers"]) >= 5
+        "is_complete": answer_count >= 5
     }
 
-@api_router.post("/interviews/{interview_id}/complete")
-async def complete_interview(interview_id: str, current_user: dict = Depends(get_current_user)):
+async def load_completable_interview(interview_id: str, user_id: str) -> dict:
     interview = await db.interviews.find_one(
-        {"id": interview_id, "user_id": current_user["sub"]},
-        {"_id": 0}
+        {"id": interview_id, "user_id": user_id},
+        {"_id": 0, "questions": 0}
     )
     
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    if len(interview["answers"]) < 5:
+    answers = await answer_store.list(interview_id)
+    if len(answers) < 5:
         raise HTTPException(status_code=400, detail="Interview not complete")
     
-    scores = [ans["score"] for ans in interview["answers"]]
+    interview["answers"] = answers
+    return interview
+
+def score_answers(answers: List[dict]):
+    scores = [ans["score"] for ans in answers]
     overall_score = sum(scores) / len(scores)
     
     breakdown = {
-        "clarity": sum(ans["evaluation"]["clarity"] for ans in interview["answers"]) / len(interview["answers"]),
-        "confidence": sum(ans["evaluation"]["confidence"] for ans in interview["answers"]) / len(interview["answers"]),
-        "structure": sum(ans["evaluation"]["structure"] for ans in interview["answers"]) / len(interview["answers"]),
-        "relevance": sum(ans["evaluation"]["relevance"] for ans in interview["answers"]) / len(interview["answers"])
+        "clarity": sum(ans["evaluation"]["clarity"] for ans in answers) / len(answers),
+        "confidence": sum(ans["evaluation"]["confidence"] for ans in answers) / len(answers),
+        "structure": sum(ans["evaluation"]["structure"] for ans in answers) / len(answers),
+        "relevance": sum(ans["evaluation"]["relevance"] for ans in answers) / len(answers)
     }
     
-    weak_areas = []
-    for key, value in breakdown.items():
-        if value < 6.5:
-            weak_areas.append(key.capitalize())
-    
-    strengths = []
-    for key, value in breakdown.items():
-        if value >= 8.0:
-            strengths.append(f"Strong {key}")
-    
-    if not strengths:
-        strengths = ["Completed the interview", "Attempted all questions"]
+    return overall_score, breakdown, readiness_for(overall_score)
+
+def readiness_for(overall_score: float) -> ReadinessStatus:
+    if overall_score >= 8.0:
+        return ReadinessStatus.READY
+    if overall_score >= 6.0:
+        return ReadinessStatus.NEEDS_PRACTICE
+    return ReadinessStatus.NOT_READY
+
+def strengths_for(breakdown: dict) -> List[str]:
+    strengths = [f"Strong {key}" for key, value in breakdown.items() if value >= 8.0]
+    return strengths or ["Completed the interview", "Attempted all questions"]
+
+def low_scoring_answers(answers: List[dict]) -> List[dict]:
+    return [ans for ans in answers if ans["score"] < 7.0]
+
+async def apply_stats_once(interview_id: str, step: str, apply: Callable[[], Awaitable[None]]):
+    # stats_applied.<step> holds the claim time while the step runs and True
+    # once it succeeded. A step that raised is unclaimed so a retry redoes it,
+    # and a claim older than STATS_CLAIM_LEASE (its process died) is taken
+    # over. Each step records the interview id in the same write that counts
+    # it, so a step that wrote but was never marked True is not counted twice.
+    # Interviews completed with stats_applied: True are left alone.
+    field = f"stats_applied.{step}"
+    claimed_at = datetime.now(timezone.utc)
+    expired = (claimed_at - timedelta(seconds=STATS_CLAIM_LEASE)).isoformat()
+    claimed = await db.interviews.update_one(
+        {
+            "id": interview_id,
+            "stats_applied": {"$ne": True},
+            "$or": [{field: {"$exists": False}}, {field: {"$lt": expired}}]
+        },
+        {"$set": {field: claimed_at.isoformat()}}
+    )
+    if claimed.modified_count == 0:
+        return
+    try:
+        await apply()
+    except BaseException:
+        await db.interviews.update_one({"id": interview_id, field: claimed_at.isoformat()}, {"$unset": {field: ""}})
+        raise
+    await db.interviews.update_one({"id": interview_id}, {"$set": {field: True}})
+
+async def apply_user_stats(user_id: str, interview_id: str, overall_score: float, readiness: ReadinessStatus):
+    # One atomic update for the counters, guarded by and recording the
+    # interview id; users created before score_sum existed start from
+    # average_score * total_interviews.
+    user = await db.users.find_one_and_update(
+        {"id": user_id, "applied_interviews": {"$ne": interview_id}},
+        [{"$set": {
+            "score_sum": {"$add": [
+                {"$ifNull": ["$score_sum", {"$multiply": ["$average_score", "$total_interviews"]}]},
+                overall_score
+            ]},
+            "total_interviews": {"$add": ["$total_interviews", 1]},
+            "readiness_status": readiness.value,
+            "applied_interviews": {"$slice": [
+                {"$concatArrays": [{"$ifNull": ["$applied_interviews", []]}, [interview_id]]},
+                -APPLIED_INTERVIEWS_LIMIT
+            ]}
+        }}],
+        projection={"_id": 0, "score_sum": 1, "average_score": 1, "total_interviews": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if user is None:
+        return
+    total = user["total_interviews"] + 1
+    score_sum = user.get("score_sum")
+    if score_sum is None:
+        score_sum = user["average_score"] * user["total_interviews"]
+    score_sum += overall_score
+    # Skipped when a concurrent completion has already moved the counters;
+    # that completion sets the average from its own, later snapshot.
+    await db.users.update_one(
+        {"id": user_id, "total_interviews": total},
+        {"$set": {"average_score": round(score_sum / total, 2)}}
+    )
+    user_cache.invalidate(user_id)
+
+async def finalize_interview(interview: dict, user_id: str, feedbacks: List[dict]) -> dict:
+    overall_score, breakdown, readiness = score_answers(interview["answers"])
+    strengths = strengths_for(breakdown)
     
     mistakes = []
     tips = []
     
-    for ans in interview["answers"]:
-        if ans["score"] < 7.0:
-            feedback = await ai_service.generate_feedback(
-                question=ans["question"],
-                user_answer=ans["answer"],
-                score=ans["score"]
-            )
-            
-            if feedback.get("mistakes"):
-                mistakes.extend(feedback["mistakes"][:1])
-            if feedback.get("tips"):
-                tips.extend(feedback["tips"][:1])
+    for feedback in feedbacks:
+        if feedback.get("mistakes"):
+            mistakes.extend(feedback["mistakes"][:1])
+        if feedback.get("tips"):
+            tips.extend(feedback["tips"][:1])
     
     if not tips:
         tips = ["Practice STAR method", "Use specific examples", "Be concise and structured"]
@@ -369,18 +451,11 @@ async def complete_interview(interview_id: str, current_user: dict = Depends(get
     tips = list(set(tips))[:3]
     mistakes = mistakes[:3]
     
-    if overall_score >= 8.0:
-        readiness = ReadinessStatus.READY
-    elif overall_score >= 6.0:
-        readiness = ReadinessStatus.NEEDS_PRACTICE
-    else:
-        readiness = ReadinessStatus.NOT_READY
-    
     evaluation_id = str(uuid.uuid4())
     evaluation_dict = {
         "id": evaluation_id,
-        "interview_id": interview_id,
-        "user_id": current_user["sub"],
+        "interview_id": interview["id"],
+        "user_id": user_id,
         "overall_score": round(overall_score, 2),
         "breakdown": {k: round(v, 2) for k, v in breakdown.items()},
         "strengths": strengths,
@@ -390,41 +465,317 @@ async def complete_interview(interview_id: str, current_user: dict = Depends(get
         "created_at": datetime.now(timezone.utc).isoformat()
     }
     
-    await db.evaluations.insert_one(evaluation_dict)
+    # Completion may be retried (background jobs, client retries), so every
+    # write below is conditional: the first evaluation stored for an interview
+    # wins, and each stats step is applied through its own stats_applied claim.
+    try:
+        await db.evaluations.update_one(
+            {"interview_id": interview["id"], "user_id": user_id},
+            {"$setOnInsert": evaluation_dict},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        pass
+    evaluation_dict = await db.evaluations.find_one({"interview_id": interview["id"], "user_id": user_id}, {"_id": 0})
     
+    completed_at = datetime.now(timezone.utc).isoformat()
     await db.interviews.update_one(
-        {"id": interview_id},
+        {"id": interview["id"], "status": {"$ne": "completed"}},
         {"$set": {
             "status": "completed",
-            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "completed_at": completed_at,
             "overall_score": round(overall_score, 2)
         }}
     )
     
-    user = await db.users.find_one({"id": current_user["sub"]}, {"_id": 0})
-    total_interviews = user["total_interviews"] + 1
-    new_avg = ((user["average_score"] * user["total_interviews"]) + overall_score) / total_interviews
+    weaknesses = [
+        ans["evaluation"]["weakness_identified"] for ans in interview["answers"]
+        if ans.get("evaluation", {}).get("weakness_identified")
+    ]
+    completed_at = interview.get("completed_at") or completed_at
+    await apply_stats_once(interview["id"], "user", lambda: apply_user_stats(user_id, interview["id"], overall_score, readiness))
+    await apply_stats_once(interview["id"], "rollup", lambda: user_rollups.apply(
+        user_id, {**interview, "completed_at": completed_at}, overall_score, breakdown, weaknesses
+    ))
+    await apply_stats_once(interview["id"], "insights", lambda: insight_buckets.apply(interview["id"], completed_at, interview["answers"]))
     
-    await db.users.update_one(
-        {"id": current_user["sub"]},
-        {"$set": {
-            "total_interviews": total_interviews,
-            "average_score": round(new_avg, 2),
-            "readiness_status": readiness.value
-        }}
-    )
+    return evaluation_dict
+
+async def regrade_completed_interviews(interviews: List[dict]):
+    # Answers of these completed interviews were re-evaluated: recompute each
+    # interview's score and stored evaluation, then rebuild what was derived
+    # from them (user stats, rollups and the insight days they fall on).
+    interview_updates, evaluation_updates = [], []
+    for interview in interviews:
+        overall_score, breakdown, readiness = score_answers(await answer_store.list(interview["id"]))
+        interview_updates.append(UpdateOne({"id": interview["id"]}, {"$set": {"overall_score": round(overall_score, 2)}}))
+        evaluation_updates.append(UpdateOne(
+            {"interview_id": interview["id"], "user_id": interview["user_id"]},
+            {"$set": {
+                "overall_score": round(overall_score, 2),
+                "breakdown": {k: round(v, 2) for k, v in breakdown.items()},
+                "strengths": strengths_for(breakdown),
+                "readiness_flag": readiness.value
+            }}
+        ))
+    await db.interviews.bulk_write(interview_updates, ordered=False)
+    await db.evaluations.bulk_write(evaluation_updates, ordered=False)
     
+    for user_id in {interview["user_id"] for interview in interviews}:
+        rollup = await user_rollups.rebuild(db, answer_store, user_id)
+        if rollup["interviews"]:
+            await db.users.update_one({"id": user_id}, {"$set": {
+                "total_interviews": rollup["interviews"],
+                "score_sum": rollup["score_sum"],
+                "average_score": round(rollup["score_sum"] / rollup["interviews"], 2),
+                "readiness_status": readiness_for(rollup["history"][-1]["overall_score"]).value
+            }})
+        user_cache.invalidate(user_id)
+    
+    days = sorted({interview["completed_at"][:10] for interview in interviews if interview.get("completed_at")})
+    await insight_buckets.rebuild(db, answer_store, only_days=days)
+
+@api_router.post("/interviews/{interview_id}/complete")
+async def complete_interview(interview_id: str, current_user: dict = Depends(get_current_user)):
+    interview = await load_completable_interview(interview_id, current_user["sub"])
+    evaluation_dict = await complete_with_feedback(interview, current_user["sub"])
     return Evaluation(**evaluation_dict)
 
+async def complete_with_feedback(interview: dict, user_id: str) -> dict:
+    low_scoring = low_scoring_answers(interview["answers"])
+    feedbacks = await ai_service.gather(
+        [feedback_call(ans) for ans in low_scoring],
+        fallback=lambda i, e: fallback_feedback(low_scoring[i])
+    )
+    return await finalize_interview(interview, user_id, feedbacks)
+
+async def run_completion_job(job: dict, report) -> str:
+    interview = await load_completable_interview(job["interview_id"], job["user_id"])
+    
+    low_scoring = low_scoring_answers(interview["answers"])
+    await report("feedback", 0, len(low_scoring))
+    done = 0
+    
+    def tracked(ans: dict):
+        async def call():
+            nonlocal done
+            feedback = await feedback_call(ans)()
+            done += 1
+            await report("feedback", done, len(low_scoring))
+            return feedback
+        return call
+    
+    feedbacks = await ai_service.gather(
+        [tracked(ans) for ans in low_scoring],
+        fallback=lambda i, e: fallback_feedback(low_scoring[i])
+    )
+    
+    await report("saving", len(low_scoring), len(low_scoring))
+    evaluation_dict = await finalize_interview(interview, job["user_id"], feedbacks)
+    return evaluation_dict["id"]
+
+completion_queue = CompletionQueue(db, run_completion_job)
+
+async def session_error(websocket: WebSocket, status_code: int, detail: str):
+    await websocket.send_json({"type": "error", "status": status_code, "detail": detail})
+
+async def session_answer(websocket: WebSocket, session: InterviewSession, message: dict):
+    question = session.question(message.get("question_id"))
+    if not question:
+        return await session_error(websocket, 404, "Question not found")
+    if question["number"] <= session.answer_count:
+        return await session_error(websocket, 409, "Question already answered")
+    if not isinstance(message.get("answer_text"), str):
+        return await session_error(websocket, 422, "answer_text is required")
+    
+    async def saved(evaluation: dict, answer_obj: dict):
+        # Acknowledged as soon as the answer is scored and durable; the next
+        # question follows in its own frame once it is ready.
+        session.record_answer(question["number"], answer_obj)
+        await session.flush()
+        await websocket.send_json({
+            "type": "answer_saved",
+            "question_id": question["id"],
+            "evaluation": evaluation,
+            "is_complete": question["number"] >= 5
+        })
+    
+    try:
+        _, _, next_question = await evaluate_submission(
+            session.interview, question, message["answer_text"],
+            session.previous_answer(question["number"]), session.interview["user_id"],
+            on_evaluated=saved
+        )
+    except SessionConflict:
+        await session.reload()
+        await session_error(websocket, 409, "Question already answered")
+        return await websocket.send_json({"type": "state", **session.snapshot()})
+    
+    if next_question:
+        # Durable before it is sent, so a REST call can answer it too.
+        session.add_question(next_question)
+        await session.flush()
+        await websocket.send_json({"type": "question", "question": next_question})
+
+async def receive_session_message(websocket: WebSocket) -> Optional[dict]:
+    # None for a frame that is not a JSON object (binary, malformed, a list...).
+    try:
+        message = await websocket.receive_json()
+    except (ValueError, KeyError, TypeError):
+        return None
+    return message if isinstance(message, dict) else None
+
+async def session_complete(websocket: WebSocket, session: InterviewSession):
+    if session.answer_count < 5:
+        return await session_error(websocket, 400, "Interview not complete")
+    await session.flush()
+    evaluation_dict = await complete_with_feedback(
+        {**session.interview, "answers": session.answers}, session.interview["user_id"]
+    )
+    await session.reload()
+    await websocket.send_json({"type": "completed", "evaluation": Evaluation(**evaluation_dict).model_dump(mode="json")})
+
+@api_router.websocket("/interviews/{interview_id}/session")
+async def interview_session(websocket: WebSocket, interview_id: str, token: str):
+    # The interview flow over one connection, authenticated once (browsers
+    # cannot set headers on a WebSocket, hence the token query parameter).
+    # Client messages: {"type": "answer", "question_id", "answer_text"} and
+    # {"type": "complete"}. Server messages: "state" on connect and after a
+    # conflict, "answer_saved", "question", "completed" and "error". The REST
+    # endpoints remain and see the same stored state.
+    try:
+        current_user = decode_token(token)
+    except HTTPException:
+        return await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+    
+    session = await InterviewSession.load(db, answer_store, interview_id, current_user["sub"])
+    if not session:
+        return await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+    
+    await websocket.accept()
+    try:
+        await websocket.send_json({"type": "state", **session.snapshot()})
+        while True:
+            message = await receive_session_message(websocket)
+            if message is None:
+                await session_error(websocket, 400, "Messages must be JSON objects")
+            elif message.get("type") == "answer":
+                await session_answer(websocket, session, message)
+            elif message.get("type") == "complete":
+                await session_complete(websocket, session)
+            else:
+                await session_error(websocket, 400, "Unknown message type")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if session.pending:
+            try:
+                await session.flush()
+            except Exception as e:
+                logger.error(f"Could not persist session state for interview {interview_id}: {e!r}")
+
+@api_router.post("/interviews/{interview_id}/complete/async", status_code=status.HTTP_202_ACCEPTED)
+async def complete_interview_async(interview_id: str, current_user: dict = Depends(get_current_user)):
+    interview = await db.interviews.find_one(
+        {"id": interview_id, "user_id": current_user["sub"]},
+        {"_id": 0, "answer_count": 1}
+    )
+    
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    if interview.get("answer_count", 0) < 5:
+        raise HTTPException(status_code=400, detail="Interview not complete")
+    
+    job = await completion_queue.enqueue(interview_id, current_user["sub"])
+    return {**job, "status_url": f"/api/interviews/jobs/{job['id']}"}
+
+@api_router.get("/interviews/jobs/{job_id}")
+async def get_completion_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    job = await completion_queue.get(job_id, current_user["sub"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@api_router.post("/interviews/{interview_id}/complete/stream")
+async def complete_interview_stream(interview_id: str, current_user: dict = Depends(get_current_user)):
+    interview = await load_completable_interview(interview_id, current_user["sub"])
+    
+    async def events():
+        finalizing = None
+        try:
+            overall_score, breakdown, readiness = score_answers(interview["answers"])
+            yield sse_event("score", {
+                "overall_score": round(overall_score, 2),
+                "breakdown": {k: round(v, 2) for k, v in breakdown.items()},
+                "readiness_flag": readiness.value
+            })
+            
+            low_scoring = low_scoring_answers(interview["answers"])
+            feedbacks = [None] * len(low_scoring)
+            async for index, event, data in merge_feedback_streams(
+                [feedback_stream(ans) for ans in low_scoring],
+                limit=ai_service.request_concurrency,
+                fallback=lambda i: fallback_feedback(low_scoring[i])
+            ):
+                if event == "feedback":
+                    feedbacks[index] = data
+                    data = detailed_feedback_item(low_scoring[index], data)
+                yield sse_event(event, {"index": index, **data})
+            
+            # Shielded: once started, a disconnect does not interrupt the writes.
+            finalizing = asyncio.ensure_future(finalize_interview(interview, current_user["sub"], feedbacks))
+            evaluation_dict = await asyncio.shield(finalizing)
+            yield sse_event("evaluation", Evaluation(**evaluation_dict).model_dump(mode="json"))
+            yield sse_event("done", {})
+        finally:
+            if finalizing is None:
+                # The stream ended (client gone, or an error) before completion
+                # started; the completion queue finishes the interview instead.
+                await asyncio.shield(completion_queue.enqueue(interview_id, current_user["sub"]))
+    
+    return sse_response(events())
+
 @api_router.get("/interviews/history")
-async def get_interview_history(current_user: dict = Depends(get_current_user)):
-    interviews = await db.interviews.find(
+async def get_interview_history(
+    response: Response,
+    fields: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    current_user: dict = Depends(get_current_user)
+):
+    projection, hidden = select_fields(
+        fields,
+        [f for f in INTERVIEW_HEADER if f != "_id"],
+        always=("started_at", "id")
+    )
+    interviews, next_cursor = await paginate(
+        db.interviews,
         {"user_id": current_user["sub"]},
-        {"_id": 0}
-    ).sort("started_at", -1).to_list(100)
+        [("started_at", -1), ("id", -1)],
+        projection,
+        hidden,
+        limit=limit,
+        cursor=cursor
+    )
     
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return interviews
 
+@api_router.get("/interviews/{interview_id}")
+async def get_interview(interview_id: str, current_user: dict = Depends(get_current_user)):
+    interview = await db.interviews.find_one(
+        {"id": interview_id, "user_id": current_user["sub"]},
+        {"_id": 0, "stats_applied": 0}
+    )
+    
+    if not interview:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    interview["answers"] = await answer_store.list(interview_id, {"interview_id": 0, "user_id": 0})
+    return interview
+
 @api_router.get("/evaluations/{interview_id}")
 async def get_evaluation(interview_id: str, current_user: dict = Depends(get_current_user)):
     evaluation = await db.evaluations.find_one(
@@ -435,200 +786,302 @@ async def get_evaluation(interview_id: str, current_user: dict = Depends(get_cur
     if not evaluation:
         raise HTTPException(status_code=404, detail="Evaluation not found")
     
-    interview = await db.interviews.find_one({"id": interview_id}, {"_id": 0})
-    
-    detailed_feedback = []
-    for ans in interview.get("answers", []):
-        feedback = await ai_service.generate_feedback(
-            question=ans["question"],
-            user_answer=ans["answer"],
-            score=ans["score"]
-        )
-        
-        detailed_feedback.append({
-            "question": ans["question"],
-            "your_answer": ans["answer"],
-            "score": ans["score"],
-            "improved_answer": feedback.get("improved_answer", ""),
-            "why_improved": feedback.get("why_improved", ""),
-            "mistakes": feedback.get("mistakes", [])
-        })
+    answers = await answer_store.list(interview_id)
+    feedbacks = await ai_service.gather(
+        [feedback_call(ans) for ans in answers],
+        fallback=lambda i, e: fallback_feedback(answers[i])
+    )
     
-    evaluation["detailed_feedback"] = detailed_feedback
+    evaluation["detailed_feedback"] = [
+        detailed_feedback_item(ans, feedback) for ans, feedback in zip(answers, feedbacks)
+    ]
     return evaluation
 
-@api_router.get("/analytics/dashboard")
-async def get_dashboard_analytics(current_user: dict = Depends(get_current_user)):
-    user = await db.users.find_one({"id": current_user["sub"]}, {"_id": 0})
-    
-    interviews = await db.interviews.find(
-        {"user_id": current_user["sub"], "status": "completed"},
+@api_router.get("/evaluations/{interview_id}/stream")
+async def get_evaluation_stream(interview_id: str, current_user: dict = Depends(get_current_user)):
+    evaluation = await db.evaluations.find_one(
+        {"interview_id": interview_id, "user_id": current_user["sub"]},
         {"_id": 0}
-    ).sort("completed_at", 1).to_list(100)
+    )
     
-    growth_data = []
-    for interview in interviews:
-        if interview.get("overall_score"):
-            growth_data.append({
-                "date": interview["completed_at"][:10],
-                "score": interview["overall_score"],
-                "type": interview["interview_type"]
-            })
+    if not evaluation:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
     
-    weak_areas = {}
-    for interview in interviews:
-        for ans in interview.get("answers", []):
-            weakness = ans.get("evaluation", {}).get("weakness_identified", "")
-            if weakness:
-                weak_areas[weakness] = weak_areas.get(weakness, 0) + 1
+    answers = await answer_store.list(interview_id)
+    
+    async def events():
+        yield sse_event("evaluation", evaluation)
+        async for index, event, data in merge_feedback_streams(
+            [feedback_stream(ans) for ans in answers],
+            limit=ai_service.request_concurrency,
+            fallback=lambda i: fallback_feedback(answers[i])
+        ):
+            if event == "feedback":
+                data = detailed_feedback_item(answers[index], data)
+            yield sse_event(event, {"index": index, **data})
+        yield sse_event("done", {})
     
-    top_weak_areas = sorted(weak_areas.items(), key=lambda x: x[1], reverse=True)[:3]
+    return sse_response(events())
+
+@api_router.get("/analytics/dashboard")
+async def get_dashboard_analytics(user: dict = Depends(get_current_user_doc)):
+    rollup = await user_rollups.get(user["id"])
     
     return {
         "overall_score": user["average_score"],
         "total_interviews": user["total_interviews"],
         "streak": user["streak"],
         "readiness_status": user["readiness_status"],
-        "growth_data": growth_data,
-        "weak_areas": [{"area": area, "count": count} for area, count in top_weak_areas]
+        "growth_data": growth_data(rollup),
+        "weak_areas": top_weak_areas(rollup, 3),
+        "averages": averages(rollup)
     }
 
+async def get_practice_catalog() -> PracticeCatalog:
+    global practice_catalog
+    if practice_catalog is None:
+        practice_catalog = await load_catalog(db)
+    return practice_catalog
+
 @api_router.get("/practice/questions/{category}")
-async def get_practice_questions(category: InterviewType):
-    questions = QUESTION_BANK.get(category, [])
-    return [
-        {
-            "id": str(uuid.uuid4()),
-            "category": category.value,
-            **q
-        }
-        for q in questions
-    ]
+async def get_practice_questions(
+    category: InterviewType,
+    request: Request,
+    focus_area: Optional[str] = None,
+    keyword: Optional[str] = None
+):
+    catalog = await get_practice_catalog()
+    body, etag = catalog.response(category, focus_area=focus_area, keyword=keyword)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={PRACTICE_CACHE_MAX_AGE}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @api_router.get("/admin/dashboard", dependencies=[Depends(require_admin)])
-async def get_admin_dashboard():
-    total_users = await db.users.count_documents({"role": Role.USER.value})
-    
-    users = await db.users.find({"role": Role.USER.value}, {"_id": 0}).to_list(1000)
+async def get_admin_dashboard(fields: Optional[str] = None, limit: int = 5):
+    projection, _ = select_fields(fields, USER_PUBLIC_FIELDS)
+    limit = max(1, min(limit, PAGE_SIZE_MAX))
+    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
     
-    ready_count = sum(1 for u in users if u.get("readiness_status") == ReadinessStatus.READY.value)
-    needs_practice = sum(1 for u in users if u.get("readiness_status") == ReadinessStatus.NEEDS_PRACTICE.value)
+    # One round trip; every figure is computed by the server over the users
+    # matched by role, so the app tier holds only the 2 * limit users returned.
+    result = await db.users.aggregate([
+        {"$match": {"role": Role.USER.value}},
+        {"$facet": {
+            "total": [{"$count": "count"}],
+            "readiness": [{"$group": {"_id": "$readiness_status", "count": {"$sum": 1}}}],
+            "active": [{"$match": {"last_login_at": {"$gt": week_ago}}}, {"$count": "count"}],
+            "average": [
+                {"$match": {"total_interviews": {"$gt": 0}}},
+                {"$group": {"_id": None, "average_score": {"$avg": "$average_score"}}}
+            ],
+            "top_performers": [
+                {"$sort": {"average_score": -1, "id": -1}},
+                {"$limit": limit},
+                {"$project": projection}
+            ],
+            "weak_candidates": [
+                {"$match": {"total_interviews": {"$gt": 0}}},
+                {"$sort": {"average_score": 1, "id": 1}},
+                {"$limit": limit},
+                {"$project": projection}
+            ]
+        }}
+    ]).to_list(1)
+    facets = result[0]
     
-    top_performers = sorted(users, key=lambda x: x.get("average_score", 0), reverse=True)[:5]
-    weak_candidates = sorted([u for u in users if u.get("total_interviews", 0) > 0], key=lambda x: x.get("average_score", 0))[:5]
+    def count(facet: str) -> int:
+        return facets[facet][0]["count"] if facets[facet] else 0
     
-    week_ago = (datetime.now(timezone.utc).timestamp() - 7 * 24 * 3600)
-    active_this_week = 0
-    for u in users:
-        if u.get("last_login"):
-            try:
-                login_time = datetime.fromisoformat(u["last_login"]).timestamp()
-                if login_time > week_ago:
-                    active_this_week += 1
-            except:
-                pass
-    
-    if not users:
-        avg_score = 0
-    else:
-        scores = [u.get("average_score", 0) for u in users if u.get("total_interviews", 0) > 0]
-        avg_score = sum(scores) / len(scores) if scores else 0
+    readiness = {r["_id"]: r["count"] for r in facets["readiness"]}
+    avg_score = facets["average"][0]["average_score"] if facets["average"] else 0
     
     return {
-        "total_users": total_users,
-        "ready_for_interview": ready_count,
-        "needs_practice": needs_practice,
-        "active_this_week": active_this_week,
-        "average_score": round(avg_score, 2),
-        "top_performers": top_performers,
-        "weak_candidates": weak_candidates
+        "total_users": count("total"),
+        "ready_for_interview": readiness.get(ReadinessStatus.READY.value, 0),
+        "needs_practice": readiness.get(ReadinessStatus.NEEDS_PRACTICE.value, 0),
+        "active_this_week": count("active"),
+        "average_score": round(avg_score or 0, 2),
+        "top_performers": facets["top_performers"],
+        "weak_candidates": facets["weak_candidates"]
     }
 
 @api_router.get("/admin/users", dependencies=[Depends(require_admin)])
-async def get_all_users():
-    users = await db.users.find({"role": Role.USER.value}, {"_id": 0, "password": 0}).to_list(1000)
+async def get_all_users(
+    response: Response,
+    fields: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+):
+    projection, hidden = select_fields(fields, USER_PUBLIC_FIELDS, always=("average_score", "id"))
+    users, next_cursor = await paginate(
+        db.users,
+        {"role": Role.USER.value},
+        [("average_score", -1), ("id", -1)],
+        projection,
+        hidden,
+        limit=limit,
+        cursor=cursor
+    )
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return users
 
 @api_router.get("/admin/users/{user_id}", dependencies=[Depends(require_admin)])
 async def get_user_detail(user_id: str):
-    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password": 0})
+    user, rollup = await asyncio.gather(
+        db.users.find_one({"id": user_id}, USER_PRIVATE_PROJECTION),
+        user_rollups.get(user_id)
+    )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
+    return {
+        "user": user,
+        "interviews": [{**entry, "status": "completed"} for entry in rollup.get("history", [])],
+        "growth_data": growth_data(rollup),
+        "weak_areas": top_weak_areas(rollup, 5),
+        "averages": averages(rollup)
+    }
+
+@api_router.get("/admin/insights", dependencies=[Depends(require_admin)])
+async def get_platform_insights(
+    window: InsightWindow = InsightWindow.ALL,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+):
+    # An explicit start/end (inclusive UTC days) overrides the preset window.
+    if start is None and end is None and window != InsightWindow.ALL:
+        end = datetime.now(timezone.utc).date()
+        start = end - timedelta(days=int(window.value[:-1]) - 1)
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    
+    insights = await insight_buckets.summarize(
+        start.isoformat() if start else None,
+        end.isoformat() if end else None
+    )
+    insights["window"] = {
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None
+    }
+    return insights
+
+@api_router.post("/admin/evaluations/batch", dependencies=[Depends(require_admin)])
+async def batch_evaluate_answers(request: BatchEvaluationRequest):
+    if len(request.items) > BATCH_EVALUATION_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_EVALUATION_MAX_ITEMS} items per batch")
+    
+    interview_ids = list({item.interview_id for item in request.items})
     interviews = await db.interviews.find(
-        {"user_id": user_id, "status": "completed"},
-        {"_id": 0}
-    ).sort("completed_at", 1).to_list(100)
+        {"id": {"$in": interview_ids}},
+        {"_id": 0, "id": 1, "user_id": 1, "interview_type": 1, "status": 1, "completed_at": 1, "questions": 1}
+    ).to_list(len(interview_ids))
+    interviews = {i["id"]: i for i in interviews}
+    stored = await answer_store.for_interviews(interview_ids, {"interview_id": 1, "question_id": 1, "answer": 1})
+    stored = {(a["interview_id"], a["question_id"]): a for a in stored}
     
-    growth_data = []
-    for interview in interviews:
-        if interview.get("overall_score"):
-            growth_data.append({
-                "date": interview["completed_at"][:10],
-                "score": interview["overall_score"],
-                "type": interview["interview_type"]
-            })
+    results = []
+    to_evaluate = []
+    for item in request.items:
+        interview = interviews.get(item.interview_id)
+        question = next((q for q in interview["questions"] if q["id"] == item.question_id), None) if interview else None
+        existing = stored.get((item.interview_id, item.question_id))
+        answer_text = item.answer_text if item.answer_text is not None else (existing or {}).get("answer")
+        
+        result = {"interview_id": item.interview_id, "question_id": item.question_id}
+        results.append(result)
+        if not question:
+            result["error"] = "Question not found"
+        elif interview.get("status") != "completed":
+            # Writing into a live interview would move answer_count without
+            # adding the next question, leaving it impossible to finish.
+            result["error"] = "Interview not completed"
+        elif answer_text is None:
+            result["error"] = "No answer to evaluate"
+        else:
+            to_evaluate.append((result, {
+                "question": question["question"],
+                "answer": answer_text,
+                "interview_type": interview["interview_type"],
+                "user_id": interview["user_id"],
+                "number": question["number"]
+            }))
     
-    weak_areas = {}
-    for interview in interviews:
-        for ans in interview.get("answers", []):
-            weakness = ans.get("evaluation", {}).get("weakness_identified", "")
-            if weakness:
-                weak_areas[weakness] = weak_areas.get(weakness, 0) + 1
+    evaluations = await ai_service.evaluate_answers_batch([entry for _, entry in to_evaluate], mode=request.mode)
+    
+    now = datetime.now(timezone.utc).isoformat()
+    operations = []
+    for (result, entry), evaluation in zip(to_evaluate, evaluations):
+        result["evaluation"] = evaluation
+        operations.append(UpdateOne(
+            {"interview_id": result["interview_id"], "number": entry["number"]},
+            {
+                "$set": {"answer": entry["answer"], "score": evaluation["score"], "evaluation": evaluation},
+                "$setOnInsert": {
+                    "user_id": entry["user_id"],
+                    "question_id": result["question_id"],
+                    "question": entry["question"],
+                    "submitted_at": now
+                }
+            },
+            upsert=True
+        ))
+    
+    if operations:
+        await answer_store.collection.bulk_write(operations, ordered=False)
+        await db.interviews.bulk_write([
+            UpdateOne({"id": result["interview_id"]}, {"$max": {"answer_count": entry["number"]}})
+            for (result, entry), _ in zip(to_evaluate, evaluations)
+        ], ordered=False)
     
-    top_weak_areas = sorted(weak_areas.items(), key=lambda x: x[1], reverse=True)[:5]
+    # Re-grading a completed interview must also move its score and the
+    # aggregates that were computed from it at completion.
+    completed = [interviews[i] for i in {result["interview_id"] for result, _ in to_evaluate}]
+    if completed:
+        await regrade_completed_interviews(completed)
     
     return {
-        "user": user,
-        "interviews": interviews,
-        "growth_data": growth_data,
-        "weak_areas": [{"area": area, "count": count} for area, count in top_weak_areas]
+        "evaluated": len(operations),
+        "failed": len(results) - len(operations),
+        "regraded_interviews": len(completed),
+        "results": results
     }
 
-@api_router.get("/admin/insights", dependencies=[Depends(require_admin)])
-async def get_platform_insights():
-    all_interviews = await db.interviews.find({"status": "completed"}, {"_id": 0}).to_list(1000)
-    
-    all_weak_areas = {}
-    failed_questions = {}
-    confidence_dist = {"high": 0, "medium": 0, "low": 0}
-    
-    for interview in all_interviews:
-        for ans in interview.get("answers", []):
-            eval_data = ans.get("evaluation", {})
-            weakness = eval_data.get("weakness_identified", "")
-            if weakness:
-                all_weak_areas[weakness] = all_weak_areas.get(weakness, 0) + 1
-            
-            score = ans.get("score", 0)
-            if score < 5:
-                q_text = ans.get("question", "Unknown Question")
-                failed_questions[q_text] = failed_questions.get(q_text, 0) + 1
-            
-            conf = eval_data.get("confidence", 0)
-            if conf >= 8: confidence_dist["high"] += 1
-            elif conf >= 5: confidence_dist["medium"] += 1
-            else: confidence_dist["low"] += 1
-    
-    common_mistakes = sorted(all_weak_areas.items(), key=lambda x: x[1], reverse=True)[:10]
-    most_failed = sorted(failed_questions.items(), key=lambda x: x[1], reverse=True)[:5]
-    
+@api_router.get("/admin/auth/stats", dependencies=[Depends(require_admin)])
+async def get_auth_stats():
     return {
-        "common_mistakes": [{"mistake": m, "frequency": f} for m, f in common_mistakes],
-        "most_failed_questions": [{"question": q, "count": c} for q, c in most_failed],
-        "confidence_distribution": confidence_dist,
-        "total_interviews": len(all_interviews)
+        "token_cache": token_cache.snapshot(),
+        "user_cache": user_cache.snapshot()
+    }
+
+@api_router.get("/admin/ai/stats", dependencies=[Depends(require_admin)])
+async def get_ai_stats():
+    return {
+        "speculative_questions": ai_service.stats,
+        "deduplication": ai_service.dedup_stats(),
+        "provider": ai_service.provider_health(),
+        "feedback_cache": feedback_cache.stats,
+        "question_pool": question_pool.stats
     }
 
 app.include_router(api_router)
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+# Outermost, so latency includes CORS handling; SERVER_TIMING=true adds the header.
+app.add_middleware(metrics.MetricsMiddleware)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -638,29 +1091,27 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("startup")
 async def startup_event():
-    # Ensure default admin user exists
-    admin_email = "admin@interviewiq.com"
-    existing_admin = await db.users.find_one({"email": admin_email})
-    
-    if not existing_admin:
-        user_id = str(uuid.uuid4())
-        admin_dict = {
-            "id": user_id,
-            "email": admin_email,
-            "password": hash_password("admin123"),
-            "name": "Platform Admin",
-            "role": Role.ADMIN.value,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "last_login": None,
-            "total_interviews": 0,
-            "average_score": 0.0,
-            "streak": 0,
-            "readiness_status": ReadinessStatus.NOT_READY.value,
-            "consent": True
-        }
-        await db.users.insert_one(admin_dict)
-        logger.info(f"Default admin user created: {admin_email}")
+    if COLD_START_MODE:
+        # Indexes and the admin account come from `python bootstrap.py`. Jobs
+        # left by a previous instance are not scanned for here; once their
+        # lease expires, polling or re-requesting one re-queues it.
+        await completion_queue.start(resume=False)
+        return
+    await ensure_indexes(db)
+    await feedback_cache.ensure_indexes()
+    await question_pool.ensure_indexes()
+    await answer_store.ensure_indexes()
+    await user_rollups.ensure_indexes()
+    await insight_buckets.ensure_indexes()
+    await question_pool.warm()
+    await get_practice_catalog()
+    await completion_queue.ensure_indexes()
+    await completion_queue.start()
+    await ensure_default_admin(db)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    await completion_queue.stop()
+    if ai_service.created:
+        await ai_service.aclose()
+    db.close()
@@ -0,0 +1,51 @@
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Callable, List
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def merge_feedback_streams(streams: List[AsyncIterator], limit: int, fallback: Callable[[int], dict]):
+    # Runs up to `limit` (event, data) streams at once and yields
+    # (index, event, data) in arrival order. A stream that fails yields its
+    # fallback as the final "feedback" event instead.
+    queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def pump(index: int, stream):
+        try:
+            async with semaphore:
+                async for event, data in stream:
+                    await queue.put((index, event, data))
+        except Exception as e:
+            logger.warning(f"Feedback stream {index} failed: {e!r}")
+            await queue.put((index, "feedback", fallback(index)))
+        finally:
+            await queue.put(None)
+
+    tasks = [asyncio.create_task(pump(i, stream)) for i, stream in enumerate(streams)]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is None:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
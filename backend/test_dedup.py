@@ -0,0 +1,135 @@
+import asyncio
+import pytest
+from dedup import MinHashIndex, SingleFlight
+
+ANSWER = "In my last role I led the migration of our billing service to a new queue and cut latency by thirty percent"
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+        release = asyncio.Event()
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.create_task(flights.do("key", call)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+        return calls, results, flights.stats
+
+    calls, results, stats = asyncio.run(scenario())
+    assert calls == 1
+    assert results == ["result"] * 5
+    assert stats == {"calls": 5, "coalesced": 4}
+
+
+def test_single_flight_runs_again_once_the_call_finished():
+    async def scenario():
+        flights = SingleFlight()
+        results = []
+        for value in ("first", "second"):
+            async def call(value=value):
+                return value
+            results.append(await flights.do("key", call))
+        return results, flights.stats
+
+    results, stats = asyncio.run(scenario())
+    assert results == ["first", "second"]
+    assert stats["coalesced"] == 0
+
+
+def test_single_flight_keeps_distinct_keys_apart():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def call(value):
+            await asyncio.sleep(0)
+            return value
+
+        return await asyncio.gather(*(flights.do(key, lambda key=key: call(key)) for key in ("a", "b")))
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+def test_single_flight_cancelling_one_waiter_does_not_cancel_the_others():
+    async def scenario():
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "result"
+
+        first = asyncio.create_task(flights.do("key", call))
+        second = asyncio.create_task(flights.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "result"
+
+
+def test_single_flight_shares_exceptions():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0)
+            raise ValueError("provider down")
+
+        return await asyncio.gather(*(flights.do("key", call) for _ in range(2)), return_exceptions=True)
+
+    errors = asyncio.run(scenario())
+    assert all(isinstance(error, ValueError) for error in errors)
+
+
+def test_minhash_reuses_a_near_duplicate():
+    index = MinHashIndex(threshold=0.8)
+    index.add("question", ANSWER, "evaluation")
+    assert index.lookup("question", ANSWER + ".") == "evaluation"
+    assert index.lookup("question", ANSWER.upper()) == "evaluation"
+    assert index.stats == {"lookups": 2, "hits": 2}
+
+
+def test_minhash_rejects_answers_below_the_threshold():
+    index = MinHashIndex(threshold=0.8)
+    index.add("question", ANSWER, "evaluation")
+    assert index.lookup("question", "I have never worked on a team and I do not like queues at all") is None
+    # Half the shingles changed: similar, but well under 0.8.
+    assert index.lookup("question", ANSWER[:55] + " and then we rewrote the reporting pipeline in a different language") is None
+    assert index.stats["hits"] == 0
+
+
+def test_minhash_is_scoped_per_question():
+    index = MinHashIndex(threshold=0.8)
+    index.add("question", ANSWER, "evaluation")
+    assert index.lookup("other question", ANSWER) is None
+
+
+@pytest.mark.parametrize("threshold", [0, 0.0, -1, 1.5])
+def test_minhash_threshold_outside_0_1_disables_reuse(threshold):
+    index = MinHashIndex(threshold=threshold)
+    assert not index.enabled
+    index.add("question", ANSWER, "evaluation")
+    assert index.lookup("question", ANSWER) is None
+    assert index.stats == {"lookups": 0, "hits": 0}
+
+
+def test_minhash_evicts_least_recently_used_questions():
+    index = MinHashIndex(threshold=0.8, max_questions=2)
+    index.add("a", ANSWER, "a")
+    index.add("b", ANSWER, "b")
+    index.lookup("a", ANSWER)
+    index.add("c", ANSWER, "c")
+    assert index.lookup("b", ANSWER) is None
+    assert index.lookup("a", ANSWER) == "a"
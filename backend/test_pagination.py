@@ -0,0 +1,120 @@
+import asyncio
+import base64
+import json
+import pytest
+from fastapi import HTTPException
+from mongomock_motor import AsyncMongoMockClient
+from pagination import PAGE_SIZE_MAX, decode_cursor, encode_cursor, keyset_filter, paginate, page_size, select_fields
+
+SORT = [("created_at", -1), ("id", -1)]
+
+
+def raw_cursor(payload: bytes) -> str:
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def collection_with(documents):
+    collection = AsyncMongoMockClient()["test"]["items"]
+    asyncio.run(collection.insert_many([dict(d) for d in documents]))
+    return collection
+
+
+def all_pages(collection, limit, query=None):
+    async def walk():
+        pages, cursor = [], None
+        while True:
+            documents, cursor = await paginate(
+                collection, query or {}, SORT, {"_id": 0, "id": 1, "created_at": 1}, limit=limit, cursor=cursor
+            )
+            pages.append([d["id"] for d in documents])
+            if cursor is None:
+                return pages
+    return asyncio.run(walk())
+
+
+@pytest.mark.parametrize("values", [
+    ["2026-01-01T00:00:00+00:00", "b1c2"],
+    [None, "id"],
+    [3.5, 7],
+    ["ünïcödé ✓", ""],
+])
+def test_cursor_round_trip(values):
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, len(values)) == values
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    raw_cursor(b"\xff\xfe"),
+    raw_cursor(b"{not json"),
+    raw_cursor(b'{"created_at": "x"}'),
+    raw_cursor(b'"a string"'),
+    encode_cursor(["only one value"]),
+    encode_cursor(["a", "b", "c"]),
+    encode_cursor([{"$ne": None}, "id"]),
+    encode_cursor(["2026-01-01", ["id"]]),
+    encode_cursor(["2026-01-01", "id"])[:-2],
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, 2)
+    assert error.value.status_code == 400
+
+
+def test_keyset_filter_breaks_ties_on_later_keys():
+    assert keyset_filter(SORT, ["t", "b"]) == {"$or": [
+        {"created_at": {"$lt": "t"}},
+        {"created_at": "t", "id": {"$lt": "b"}},
+    ]}
+    assert keyset_filter([("score", 1), ("id", 1)], [5, "b"]) == {"$or": [
+        {"score": {"$gt": 5}},
+        {"score": 5, "id": {"$gt": "b"}},
+    ]}
+
+
+def test_pages_split_equal_created_at_without_skipping_or_repeating():
+    same = "2026-01-01T00:00:00+00:00"
+    documents = [{"id": f"{i:02d}", "created_at": same} for i in range(7)]
+    documents += [{"id": "10", "created_at": "2026-01-02T00:00:00+00:00"}, {"id": "11", "created_at": "2025-12-31T00:00:00+00:00"}]
+    pages = all_pages(collection_with(documents), limit=3)
+
+    assert [len(page) for page in pages] == [3, 3, 3]
+    assert [i for page in pages for i in page] == ["10", "06", "05", "04", "03", "02", "01", "00", "11"]
+
+
+def test_exact_multiple_of_page_size_has_no_empty_trailing_page():
+    documents = [{"id": f"{i:02d}", "created_at": "2026-01-01"} for i in range(4)]
+    pages = all_pages(collection_with(documents), limit=2)
+    assert pages == [["03", "02"], ["01", "00"]]
+
+
+def test_cursor_stays_within_the_query():
+    documents = [{"id": f"{i:02d}", "created_at": "2026-01-01", "user_id": "a" if i % 2 else "b"} for i in range(6)]
+    pages = all_pages(collection_with(documents), limit=2, query={"user_id": "a"})
+    assert pages == [["05", "03"], ["01"]]
+
+
+def test_hidden_sort_fields_are_stripped_but_still_drive_the_cursor():
+    async def first_page():
+        collection = AsyncMongoMockClient()["test"]["items"]
+        await collection.insert_many([{"id": f"{i}", "created_at": f"2026-01-0{i}", "name": f"n{i}"} for i in range(1, 4)])
+        projection, hidden = select_fields("name", ["id", "name", "created_at"], always=("created_at", "id"))
+        return await paginate(collection, {}, SORT, projection, hidden, limit=2)
+
+    documents, cursor = asyncio.run(first_page())
+    assert documents == [{"name": "n3"}, {"name": "n2"}]
+    assert decode_cursor(cursor, 2) == ["2026-01-02", "2"]
+
+
+def test_page_size_bounds():
+    assert page_size(10) == 10
+    assert page_size(PAGE_SIZE_MAX + 1) == PAGE_SIZE_MAX
+    with pytest.raises(HTTPException):
+        page_size(0)
+
+
+def test_select_fields_rejects_unknown_fields():
+    with pytest.raises(HTTPException) as error:
+        select_fields("id,password", ["id", "name"])
+    assert "password" in error.value.detail
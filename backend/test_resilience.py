@@ -0,0 +1,169 @@
+import asyncio
+import pytest
+import resilience
+from resilience import CircuitBreaker, LatencyTracker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(breaker.min_calls):
+        assert breaker.allow()
+        breaker.record(False)
+    assert breaker.state == "open"
+
+
+def test_latency_tracker_needs_min_samples():
+    tracker = LatencyTracker(min_samples=3)
+    tracker.record(1.0)
+    tracker.record(2.0)
+    assert tracker.percentile(95) is None
+    tracker.record(3.0)
+    assert tracker.percentile(50) == pytest.approx(2.0)
+
+
+def test_latency_tracker_keeps_a_rolling_window():
+    tracker = LatencyTracker(window=5, min_samples=1)
+    for seconds in (100.0, 1.0, 1.0, 1.0, 1.0, 1.0):
+        tracker.record(seconds)
+    assert tracker.percentile(100) == pytest.approx(1.0)
+
+
+def test_breaker_stays_closed_below_min_calls(clock):
+    breaker = CircuitBreaker(min_calls=10)
+    for _ in range(9):
+        assert breaker.allow()
+        breaker.record(False)
+    assert breaker.state == "closed"
+
+
+def test_breaker_stays_closed_below_failure_rate(clock):
+    breaker = CircuitBreaker(failure_rate=0.5, min_calls=10)
+    for success in [True, True, False] * 4:
+        assert breaker.allow()
+        breaker.record(success)
+    assert breaker.state == "closed"
+
+
+def test_breaker_opens_and_fails_fast_until_cooldown(clock):
+    breaker = CircuitBreaker(cooldown=30)
+    open_breaker(breaker)
+    assert not breaker.allow()
+    clock.now += 29
+    assert not breaker.allow()
+    assert breaker.stats == {"opened": 1, "rejected": 2}
+
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+
+
+def test_breaker_half_open_admits_a_single_trial(clock):
+    breaker = CircuitBreaker(cooldown=30)
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_trial_success_closes(clock):
+    breaker = CircuitBreaker(cooldown=30)
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record(True)
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_breaker_half_open_trial_failure_reopens(clock):
+    breaker = CircuitBreaker(cooldown=30)
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert breaker.stats["opened"] == 2
+    assert not breaker.allow()
+
+
+def test_breaker_release_frees_a_half_open_trial(clock):
+    breaker = CircuitBreaker(cooldown=30)
+    open_breaker(breaker)
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+
+
+def test_breaker_release_when_closed_is_a_no_op(clock):
+    breaker = CircuitBreaker()
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.state == "closed"
+    assert list(breaker.outcomes) == []
+
+
+def test_cancelled_half_open_trial_does_not_wedge_the_breaker(clock):
+    from ai_service import AIService
+
+    async def scenario():
+        service = AIService()
+        started = asyncio.Event()
+
+        async def hanging(prompt):
+            started.set()
+            await asyncio.sleep(3600)
+
+        async def answering(prompt):
+            return "ok"
+
+        open_breaker(service.breaker)
+        clock.now += service.breaker.cooldown
+        service.generate_response = hanging
+        trial = asyncio.create_task(service.complete("prompt", "question"))
+        await started.wait()
+        assert service.breaker.state == "half_open"
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        service.generate_response = answering
+        return await service.complete("prompt", "question"), service.breaker.state
+
+    assert asyncio.run(scenario()) == ("ok", "closed")
+
+
+def test_closed_stream_releases_a_half_open_trial(clock):
+    from ai_service import AIService
+
+    async def scenario():
+        service = AIService()
+
+        async def chunks(prompt):
+            for chunk in ("a", "b", "c"):
+                yield chunk
+
+        open_breaker(service.breaker)
+        clock.now += service.breaker.cooldown
+        service.stream_response = chunks
+        stream = service.stream_complete("prompt", "feedback")
+        assert await stream.__anext__() == "a"
+        await stream.aclose()
+        return service.breaker.state, service.breaker.allow()
+
+    assert asyncio.run(scenario()) == ("half_open", True)
@@ -0,0 +1,21 @@
+import re
+from typing import List
+
+# Shared by the local scorer and the practice catalog; kept free of numpy so
+# the catalog can be built without loading the scorer.
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an the and or but if of to in on at for with by from as is are was were be been being it its this that
+these those i me my we our you your he she they them their what which who how why when where do does did
+have has had not no so than then there here about into over also just very can could would should will
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(TOKEN_RE.findall(question.lower()))
@@ -0,0 +1,45 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", "30"))
+# Leaves out the password hash and the counters only the stats writes use.
+USER_PRIVATE_PROJECTION = {"_id": 0, "password": 0, "score_sum": 0, "applied_interviews": 0}
+
+
+class UserCache:
+    # Per-worker cache of user documents (USER_PRIVATE_PROJECTION). Writes
+    # made by this worker invalidate explicitly; the TTL bounds how long a
+    # write made by another worker can go unseen.
+
+    def __init__(self, collection, max_entries: int = USER_CACHE_SIZE, ttl: float = USER_CACHE_TTL):
+        self.collection = collection
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() < entry[1]:
+            self._entries.move_to_end(user_id)
+            self.stats["hits"] += 1
+            return entry[0]
+
+        self.stats["misses"] += 1
+        user = await self.collection.find_one({"id": user_id}, USER_PRIVATE_PROJECTION)
+        if user is not None:
+            self._entries[user_id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id: str):
+        if self._entries.pop(user_id, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "size": len(self._entries)}
@@ -45,8 +45,8 @@ const InterviewFlow = () => {
 
   const loadInterview = async () => {
     try {
-      const response = await interviewAPI.getHistory();
-      const currentInterview = response.data.find(i => i.id === interviewId);
+      const response = await interviewAPI.get(interviewId);
+      const currentInterview = response.data;
       setInterview(currentInterview);
       if (currentInterview.questions.length > 0) {
         setCurrentQuestion(currentInterview.questions[currentInterview.answers.length]);
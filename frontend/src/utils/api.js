@@ -27,6 +27,7 @@ export const interviewAPI = {
   submitAnswer: (data) => api.post('/interviews/answer', data),
   complete: (interviewId) => api.post(`/interviews/${interviewId}/complete`),
   getHistory: () => api.get('/interviews/history'),
+  get: (interviewId) => api.get(`/interviews/${interviewId}`),
 };
 
 export const evaluationAPI = {
@@ -41,9 +42,21 @@ export const practiceAPI = {
   getQuestions: (category) => api.get(`/practice/questions/${category}`),
 };
 
+// Pages are capped server-side; follow X-Next-Cursor until the last one.
+const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let cursor;
+  do {
+    const response = await api.get(url, { params: { ...params, limit: 500, cursor } });
+    items.push(...response.data);
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return { data: items };
+};
+
 export const adminAPI = {
   getDashboard: () => api.get('/admin/dashboard'),
-  getUsers: () => api.get('/admin/users'),
+  getUsers: () => getAllPages('/admin/users'),
   getUserDetail: (userId) => api.get(`/admin/users/${userId}`),
   getInsights: () => api.get('/admin/insights'),
 };